@@ -1,50 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from app.config import settings
 from app.core.security import (
     create_access_token, 
-    verify_password, 
-    get_password_hash
+    get_current_user_record
 )
-from app.schemas.user import UserCreate, UserResponse, Token
-from app.services.user_service import create_user, get_user_by_username
+from app.core.password_hashing import hash_password, verify_and_update_password
+from app.models.user import UserRole
+from app.schemas.user import UserCreate, UserResponse, UserRecord, UserRoleUpdate, Token
+from app.services.user_service import create_user, get_user_by_username, update_user_role, update_password_hash
 from app.core.database import get_db
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = get_user_by_username(db, user.username)
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    existing_user = await get_user_by_username(db, user.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Username already registered"
         )
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     
-    return create_user(db, user, hashed_password)
+    return await create_user(db, user, hashed_password)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user_by_username(db, form_data.username)
+    user = await get_user_by_username(db, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    if new_hash:
+        await update_password_hash(db, user, new_hash)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={
             "sub": user.username, 
+            "uid": user.id,
             "role": user.role.value
         }, 
         expires_delta=access_token_expires
@@ -53,4 +62,19 @@ def login_for_access_token(
     return {
         "access_token": access_token, 
         "token_type": "bearer"
-    }
\ No newline at end of file
+    }
+
+@router.put("/users/{user_id}/role", response_model=UserResponse)
+async def change_user_role(
+    user_id: int,
+    body: UserRoleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserRecord = Depends(get_current_user_record)
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action"
+        )
+    
+    return await update_user_role(db, user_id, body.role)
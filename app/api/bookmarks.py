@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user_record
 from app.schemas.bookmark import (
     BookmarkCreate, 
     BookmarkResponse, 
@@ -13,8 +14,7 @@ from app.services.bookmark_service import (
     delete_bookmark, 
     get_bookmark_by_id
 )
-from app.services.user_service import get_user_by_username
-from app.schemas.user import TokenData
+from app.schemas.user import UserRecord
 
 router = APIRouter()
 
@@ -23,14 +23,12 @@ router = APIRouter()
     response_model=BookmarkResponse, 
     status_code=status.HTTP_201_CREATED
 )
-def add_bookmark(
+async def add_bookmark(
     bookmark: BookmarkCreate, 
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    db_bookmark = create_bookmark(
+    db_bookmark = await create_bookmark(
         db, 
         bookmark=bookmark, 
         user_id=user.id
@@ -39,34 +37,35 @@ def add_bookmark(
     return db_bookmark
 
 @router.get("/", response_model=BookmarkListResponse)
-def read_user_bookmarks(
+async def read_user_bookmarks(
     skip: int = 0, 
     limit: int = 10, 
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    result = list_user_bookmarks(
+    result = await list_user_bookmarks(
         db, 
         user_id=user.id, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total
     )
     return {
         "bookmarks": result["bookmarks"],
-        "total": result["total"]
+        "total": result["total"],
+        "next_cursor": result["next_cursor"]
     }
 
 @router.delete("/{bookmark_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_bookmark(
+async def remove_bookmark(
     bookmark_id: int,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    bookmark = get_bookmark_by_id(db, bookmark_id)
+    bookmark = await get_bookmark_by_id(db, bookmark_id)
     
     if bookmark.user_id != user.id:
         raise HTTPException(
@@ -74,7 +73,7 @@ def remove_bookmark(
             detail="Not authorized to delete this bookmark"
         )
     
-    delete_bookmark(
+    await delete_bookmark(
         db, 
         bookmark_id=bookmark_id
     )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from app.models.user import UserRole
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
+from app.core.http_cache import check_not_modified, json_response, render_json, response_cache_key
+from app.core.security import require_role
 from app.schemas.category import (
     CategoryCreate, 
     CategoryResponse, 
@@ -12,86 +13,91 @@ from app.schemas.category import (
 from app.services.category_service import (
     create_category, 
     list_categories, 
-    get_category_by_id,
+    get_category,
     update_category,
     delete_category
 )
-from app.services.user_service import get_user_by_username
-from app.schemas.user import TokenData
+from app.services.redis_cache_service import CATEGORIES_VERSION_KEY, cache_response, get_cached_response, get_versions
+from app.schemas.user import UserRecord
 
 router = APIRouter()
 
+async def categories_not_modified(request: Request, response: Response) -> Optional[Dict[str, str]]:
+    return check_not_modified(request, response, await get_versions([CATEGORIES_VERSION_KEY]))
+
 @router.post(
     "/", 
     response_model=CategoryResponse, 
     status_code=status.HTTP_201_CREATED
 )
-def create_new_category(
+async def create_new_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(require_role(UserRole.ADMIN))
 ):
-    user = get_user_by_username(db, current_user.username)
-    require_role(user.role)
-    
-    return create_category(db, category)
+    return await create_category(db, category)
 
 @router.get(
     "/", 
     response_model=CategoryListResponse
 )
-def read_categories(
+async def read_categories(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    include_total: bool = True,
+    cache_headers: Optional[Dict[str, str]] = Depends(categories_not_modified),
+    db: AsyncSession = Depends(get_db)
 ):
-    result = list_categories(
+    cache_key = response_cache_key(request, cache_headers)
+    cached_body = await get_cached_response(cache_key)
+    if cached_body is not None:
+        return json_response(cached_body, cache_headers)
+
+    result = await list_categories(
         db, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        include_total=include_total
     )
     
-    return {
+    body = render_json(CategoryListResponse, {
         "categories": result["categories"],
         "total": result["total"]
-    }
+    })
+    await cache_response(cache_key, body)
+    return json_response(body, cache_headers)
 
 @router.get(
     "/{category_id}", 
     response_model=CategoryResponse
 )
-def read_category(
+async def read_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return get_category_by_id(db, category_id)
+    return await get_category(db, category_id)
 
 @router.put(
     "/{category_id}", 
     response_model=CategoryResponse
 )
-def update_existing_category(
+async def update_existing_category(
     category_id: int,
     category: CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(require_role(UserRole.ADMIN))
 ):
-    user = get_user_by_username(db, current_user.username)
-    require_role(user.role)
-    
-    return update_category(db, category_id, category)
+    return await update_category(db, category_id, category)
 
 @router.delete(
     "/{category_id}", 
     status_code=status.HTTP_204_NO_CONTENT
 )
-def remove_category(
+async def remove_category(
     category_id: int,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(require_role(UserRole.ADMIN))
 ):
-    user = get_user_by_username(db, current_user.username)
-    require_role(user.role)
-    
-    delete_category(db, category_id)
+    await delete_category(db, category_id)
     return None
\ No newline at end of file
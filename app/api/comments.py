@@ -1,37 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
+from app.core.http_cache import check_not_modified, json_response, render_json, response_cache_key
+from app.core.security import get_current_user_record, require_role
 from app.schemas.comment import (
     CommentCreate, 
     CommentResponse, 
-    CommentListResponse
+    CommentListResponse,
+    CommentThreadListResponse,
+    CommentSubtreeResponse
 )
 from app.services.comment_service import (
     create_comment, 
     list_comments_for_post, 
+    list_comment_threads,
+    get_comment_subtree,
     delete_comment
 )
-from app.services.user_service import get_user_by_username
+from app.services.redis_cache_service import cache_response, comments_version_key, get_cached_response, get_versions
 from app.models.user import UserRole
-from app.schemas.user import TokenData
+from app.schemas.user import UserRecord
 
 router = APIRouter()
 
+async def comments_not_modified(post_id: int, request: Request, response: Response) -> Optional[Dict[str, str]]:
+    return check_not_modified(request, response, await get_versions([comments_version_key(post_id)]))
+
 @router.post(
     "/posts/{post_id}", 
     response_model=CommentResponse, 
     status_code=status.HTTP_201_CREATED
 )
-def add_comment(
+async def add_comment(
     post_id: int,
     comment: CommentCreate, 
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    db_comment = create_comment(
+    db_comment = await create_comment(
         db, 
         comment=comment, 
         post_id=post_id,
@@ -41,32 +48,72 @@ def add_comment(
     return db_comment
 
 @router.get("/posts/{post_id}", response_model=CommentListResponse)
-def read_post_comments(
+async def read_post_comments(
     post_id: int,
+    request: Request,
     skip: int = 0, 
     limit: int = 10, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    cache_headers: Optional[Dict[str, str]] = Depends(comments_not_modified),
+    db: AsyncSession = Depends(get_db)
 ):
-    result = list_comments_for_post(
+    cache_key = response_cache_key(request, cache_headers)
+    cached_body = await get_cached_response(cache_key)
+    if cached_body is not None:
+        return json_response(cached_body, cache_headers)
+
+    result = await list_comments_for_post(
         db, 
         post_id=post_id, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total
     )
-    return {
+    body = render_json(CommentListResponse, {
         "comments": result["comments"],
-        "total": result["total"]
-    }
+        "total": result["total"],
+        "next_cursor": result["next_cursor"]
+    })
+    await cache_response(cache_key, body)
+    return json_response(body, cache_headers)
+
+@router.get("/posts/{post_id}/threads", response_model=CommentThreadListResponse)
+async def read_post_comment_threads(
+    post_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    replies: int = Query(3, ge=0, le=20),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    return await list_comment_threads(
+        db, 
+        post_id=post_id, 
+        limit=limit,
+        replies=replies,
+        cursor=cursor
+    )
+
+@router.get("/{comment_id}/thread", response_model=CommentSubtreeResponse)
+async def read_comment_subtree(
+    comment_id: int,
+    limit: int = Query(200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    return await get_comment_subtree(
+        db, 
+        comment_id=comment_id, 
+        limit=limit
+    )
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_comment(
+async def remove_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    delete_comment(
+    await delete_comment(
         db, 
         comment_id=comment_id, 
         user_id=user.id, 
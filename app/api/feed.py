@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_db
+from app.core.security import get_current_user_record
+from app.schemas.feed import FeedResponse
+from app.services.feed_service import get_feed
+from app.schemas.user import UserRecord
+
+router = APIRouter()
+
+@router.get("/", response_model=FeedResponse)
+async def read_feed(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await get_feed(
+        db,
+        user_id=user.id,
+        limit=limit,
+        cursor=cursor
+    )
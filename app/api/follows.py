@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.security import get_current_user_record
+from app.schemas.feed import FollowResponse, FollowListResponse
+from app.services.follow_service import (
+    list_follows,
+    follow_author,
+    unfollow_author,
+    follow_category,
+    unfollow_category
+)
+from app.schemas.user import UserRecord
+
+router = APIRouter()
+
+@router.get("/", response_model=FollowListResponse)
+async def read_follows(
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await list_follows(db, user_id=user.id)
+
+@router.post("/authors/{author_id}", response_model=FollowResponse)
+async def add_author_follow(
+    author_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await follow_author(db, follower_id=user.id, author_id=author_id)
+
+@router.delete("/authors/{author_id}", response_model=FollowResponse)
+async def remove_author_follow(
+    author_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await unfollow_author(db, follower_id=user.id, author_id=author_id)
+
+@router.post("/categories/{category_id}", response_model=FollowResponse)
+async def add_category_follow(
+    category_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await follow_category(db, follower_id=user.id, category_id=category_id)
+
+@router.delete("/categories/{category_id}", response_model=FollowResponse)
+async def remove_category_follow(
+    category_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await unfollow_category(db, follower_id=user.id, category_id=category_id)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_db
+from app.core.security import get_current_user_record
+from app.schemas.notification import (
+    NotificationListResponse,
+    UnreadCountResponse,
+    NotificationMarkRead,
+    NotificationMarkReadResponse
+)
+from app.services.notification_service import (
+    list_notifications,
+    get_unread_count,
+    mark_notifications_read
+)
+from app.schemas.user import UserRecord
+
+router = APIRouter()
+
+@router.get("/", response_model=NotificationListResponse)
+async def read_notifications(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await list_notifications(
+        db,
+        user_id=user.id,
+        limit=limit,
+        cursor=cursor,
+        unread_only=unread_only
+    )
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def read_unread_count(
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return {
+        "unread": await get_unread_count(db, user.id)
+    }
+
+@router.post("/read", response_model=NotificationMarkReadResponse)
+async def mark_read(
+    body: NotificationMarkRead,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await mark_notifications_read(
+        db,
+        user_id=user.id,
+        notification_ids=body.ids
+    )
@@ -1,37 +1,58 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
-from app.services.user_service import get_user_by_username
+from app.core.http_cache import check_not_modified, json_response, render_json, response_cache_key
+from app.core.security import get_current_user_record, require_role
 from app.schemas.post import (
     PostCreate, 
     PostResponse, 
     PostListResponse,
+    PostBatchResponse,
+    PostBulkCreate,
+    PostBulkCreateResponse,
+    PostSearchResponse,
+    PostTrendingResponse,
     PostFilter
 )
 from app.services.post_service import (
     create_post, 
+    create_posts_bulk,
     list_posts, 
     get_post_by_id,
+    get_posts_by_ids,
+    search_posts,
+    get_trending_posts,
+    POSTS_BATCH_MAX_IDS,
     update_post,
     delete_post,
     like_post
 )
+from app.services.redis_cache_service import (
+    POSTS_LIST_VERSION_KEY,
+    cache_response,
+    get_cached_response,
+    get_versions,
+    post_cache_version_keys
+)
 from app.models.user import UserRole
-from app.schemas.user import TokenData
+from app.schemas.user import UserRecord
 
 router = APIRouter()
 
+async def posts_list_not_modified(request: Request, response: Response) -> Optional[Dict[str, str]]:
+    return check_not_modified(request, response, await get_versions([POSTS_LIST_VERSION_KEY]))
+
+async def post_not_modified(post_id: int, request: Request, response: Response) -> Optional[Dict[str, str]]:
+    return check_not_modified(request, response, await get_versions(post_cache_version_keys(post_id)))
+
 @router.post(
     "/", 
     response_model=PostResponse, 
     status_code=status.HTTP_201_CREATED
 )
-def create_new_post(post: PostCreate, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
-    user = get_user_by_username(db, current_user.username)
-    
-    return create_post(
+async def create_new_post(post: PostCreate, db: AsyncSession = Depends(get_db), user: UserRecord = Depends(get_current_user_record)):
+    return await create_post(
         db, 
         post=post, 
         author_id=user.id
@@ -41,15 +62,24 @@ def create_new_post(post: PostCreate, db: Session = Depends(get_db), current_use
     "/", 
     response_model=PostListResponse
 )
-def read_posts(
+async def read_posts(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
     category_id: Optional[int] = None,
     author_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    cache_headers: Optional[Dict[str, str]] = Depends(posts_list_not_modified),
+    db: AsyncSession = Depends(get_db)
 ):
+    cache_key = response_cache_key(request, cache_headers)
+    cached_body = await get_cached_response(cache_key)
+    if cached_body is not None:
+        return json_response(cached_body, cache_headers)
+
     filters = PostFilter(
         category_id=category_id,
         author_id=author_id,
@@ -57,41 +87,114 @@ def read_posts(
         end_date=end_date
     )
     
-    result = list_posts(
+    result = await list_posts(
         db, 
         skip=skip, 
         limit=limit, 
-        filters=filters
+        filters=filters,
+        cursor=cursor,
+        include_total=include_total
     )
     
-    return {
+    body = render_json(PostListResponse, {
         "posts": result["posts"],
-        "total": result["total"]
-    }
+        "total": result["total"],
+        "next_cursor": result["next_cursor"]
+    })
+    if result["stale"]:
+        return json_response(body)
+    
+    await cache_response(cache_key, body)
+    return json_response(body, cache_headers)
+
+@router.post(
+    "/bulk", 
+    response_model=PostBulkCreateResponse, 
+    status_code=status.HTTP_201_CREATED
+)
+async def create_posts_in_bulk(
+    body: PostBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
+):
+    return await create_posts_bulk(
+        db, 
+        posts=body.posts, 
+        author_id=user.id
+    )
+
+@router.get(
+    "/batch", 
+    response_model=PostBatchResponse
+)
+async def read_posts_batch(
+    ids: str,
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        post_ids = [int(post_id) for post_id in ids.split(",") if post_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    return await get_posts_by_ids(db, post_ids)
+
+@router.get(
+    "/search", 
+    response_model=PostSearchResponse
+)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(10, ge=1, le=POSTS_BATCH_MAX_IDS),
+    db: AsyncSession = Depends(get_db)
+):
+    return await search_posts(
+        db, 
+        query=q, 
+        limit=limit, 
+        skip=skip
+    )
+
+@router.get(
+    "/trending", 
+    response_model=PostTrendingResponse
+)
+async def read_trending_posts(
+    category_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=POSTS_BATCH_MAX_IDS),
+    db: AsyncSession = Depends(get_db)
+):
+    return await get_trending_posts(
+        db, 
+        category_id=category_id, 
+        limit=limit
+    )
 
 @router.get(
     "/{post_id}", 
-    response_model=PostResponse
+    response_model=PostResponse,
+    dependencies=[Depends(post_not_modified)]
 )
-def read_post(
+async def read_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return get_post_by_id(db, post_id)
+    return await get_post_by_id(db, post_id)
 
 @router.put(
     "/{post_id}", 
     response_model=PostResponse
 )
-def update_existing_post(
+async def update_existing_post(
     post_id: int,
     post: PostCreate,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    return update_post(
+    return await update_post(
         db, 
         post_id=post_id, 
         post_update=post,
@@ -103,14 +206,12 @@ def update_existing_post(
     "/{post_id}", 
     status_code=status.HTTP_204_NO_CONTENT
 )
-def remove_post(
+async def remove_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-    
-    delete_post(
+    await delete_post(
         db, 
         post_id=post_id, 
         user_id=user.id, 
@@ -123,14 +224,12 @@ def remove_post(
     "/{post_id}/like", 
     response_model=PostResponse
 )
-def toggle_like(
+async def toggle_like(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: UserRecord = Depends(get_current_user_record)
 ):
-    user = get_user_by_username(db, current_user.username)
-
-    return like_post(
+    return await like_post(
         db, 
         post_id=post_id, 
         user_id=user.id,
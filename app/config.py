@@ -1,22 +1,88 @@
 from pydantic_settings import BaseSettings
 import os
+from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_HOST: str = 'mysql'
     DATABASE_USER: str = 'root'
     DATABASE_PASSWORD: str = 'db2025'
     DATABASE_NAME: str = 'projektup'
+    DATABASE_URL: Optional[str] = None
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
 
     SECRET_KEY: str = os.urandom(32).hex()
     ALGORITHM: str = 'HS256'
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL: int = 60
 
     REDIS_HOST: str = 'redis'
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_PASSWORD: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
 
     KAFKA_BOOTSTRAP_SERVERS: str = 'kafka:9092'
     KAFKA_NOTIFICATION_TOPIC: str = 'notifications'
+    KAFKA_TRANSPORT: str = 'kafka'
+    KAFKA_LINGER_MS: int = 50
+    KAFKA_BATCH_SIZE: int = 500
+    KAFKA_QUEUE_MAX_SIZE: int = 10000
+    KAFKA_SHUTDOWN_FLUSH_TIMEOUT: float = 5.0
+
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    OUTBOX_DELIVERY_TIMEOUT: float = 10.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+
+    SEARCH_ENABLED: bool = True
+    SEARCH_INDEX_PATH: Optional[str] = None
+    SEARCH_SNAPSHOT_INTERVAL: int = 300
+    SEARCH_REBUILD_CHUNK_SIZE: int = 5000
+    SEARCH_BUILD_LOCK_TIMEOUT: int = 600
+    SEARCH_TITLE_BOOST: float = 2.5
+    SEARCH_COMMON_TERM_RATIO: float = 0.1
+
+    FEED_MAX_LENGTH: int = 800
+    FEED_PAGE_MAX_SIZE: int = 100
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    FEED_FANOUT_BATCH_SIZE: int = 1000
+    FEED_FANOUT_QUEUE_SIZE: int = 10000
+    FEED_BACKFILL_SIZE: int = 100
+    FEED_TTL: int = 604800
+
+    TRENDING_HALF_LIFE: int = 21600
+    TRENDING_COMPACT_INTERVAL: int = 300
+    TRENDING_MAX_SIZE: int = 10000
+    TRENDING_MIN_SCORE: float = 0.05
+
+    COUNTER_SHARDS: int = 16
+
+    CATEGORY_CATALOG_ENABLED: bool = True
+    CATEGORY_CATALOG_RELOAD_INTERVAL: int = 300
+
+    HTTP_CACHE_MAX_AGE: int = 0
+    HTTP_CACHE_SHARED_MAX_AGE: int = 5
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 30
+
+    CACHE_LOCK_TIMEOUT: float = 5.0
+    CACHE_LOCK_WAIT: float = 1.0
+    CACHE_LOCK_POLL_INTERVAL: float = 0.02
+    CACHE_XFETCH_BETA: float = 1.0
+    CACHE_STALE_TTL: int = 60
+
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = True
+    METRICS_SQL_STATEMENT_BUDGET: int = 20
 
     class Config:
         env_file = ".env"
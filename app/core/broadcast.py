@@ -0,0 +1,82 @@
+import asyncio
+import inspect
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, Optional
+from redis.exceptions import RedisError
+from app.core.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = uuid.uuid4().hex
+RECONNECT_DELAY = 1.0
+
+_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+def subscribe(channel: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+    _handlers[channel] = handler
+
+async def publish(channel: str, message: Dict[str, Any]) -> bool:
+    try:
+        await get_async_redis().publish(channel, json.dumps({"origin": WORKER_ID, "data": message}))
+        return True
+    except RedisError as e:
+        logger.error("Broadcast publish error on %s: %s", channel, e)
+        return False
+
+async def dispatch(channel: str, raw_message: bytes) -> None:
+    handler = _handlers.get(channel)
+    if handler is None:
+        return
+
+    envelope = json.loads(raw_message)
+    if envelope.get("origin") == WORKER_ID:
+        return
+
+    result = handler(envelope["data"])
+    if inspect.isawaitable(result):
+        await result
+
+class BroadcastListener:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self.task is None and _handlers:
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.subscribe(*_handlers)
+                while not self.stopping.is_set():
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    try:
+                        await dispatch(channel, message["data"])
+                    except Exception as e:
+                        logger.error("Broadcast handler error on %s: %s", channel, e)
+            except (RedisError, OSError) as e:
+                logger.error("Broadcast listener error: %s", e)
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=RECONNECT_DELAY)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                try:
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
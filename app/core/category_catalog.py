@@ -0,0 +1,59 @@
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+class CategoryCatalog:
+    def __init__(self, sequence: int = 0, post_count_sequences: Optional[Dict[int, int]] = None):
+        self.sequence = sequence
+        self.post_count_sequences = post_count_sequences or {}
+        self.categories: Dict[int, Dict[str, Any]] = {}
+        self.ids: List[int] = []
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def upsert(self, category_id: int, name: str, description: Optional[str], post_count: Optional[int] = None) -> None:
+        with self.lock:
+            category = self.categories.get(category_id)
+            if category is None:
+                bisect.insort(self.ids, category_id)
+            elif post_count is None:
+                post_count = category["post_count"]
+
+            self.categories[category_id] = {
+                "id": category_id,
+                "name": name,
+                "description": description,
+                "post_count": post_count or 0
+            }
+
+    def upsert_many(self, categories: Iterable[Tuple]) -> None:
+        with self.lock:
+            for category in categories:
+                self.upsert(*category)
+
+    def remove(self, category_id: int) -> None:
+        with self.lock:
+            if self.categories.pop(category_id, None) is not None:
+                del self.ids[bisect.bisect_left(self.ids, category_id)]
+
+    def adjust_post_counts(self, deltas: Iterable[Tuple[int, int, Optional[int]]]) -> None:
+        with self.lock:
+            for category_id, delta, sequence in deltas:
+                # Changes committed before the snapshot was read are already in its counts.
+                if sequence is not None and sequence <= self.post_count_sequences.get(category_id, 0):
+                    continue
+                category = self.categories.get(category_id)
+                if category is not None:
+                    self.categories[category_id] = {**category, "post_count": max(category["post_count"] + delta, 0)}
+
+    def get(self, category_id: int) -> Optional[Dict[str, Any]]:
+        return self.categories.get(category_id)
+
+    def missing(self, category_ids: Iterable[int]) -> List[int]:
+        return [category_id for category_id in category_ids if category_id not in self.categories]
+
+    def page(self, skip: int, limit: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self.categories[category_id] for category_id in self.ids[max(skip, 0):max(skip, 0) + max(limit, 0)]]
@@ -1,20 +1,60 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.config import settings
 
-SQLALCHEMY_DATABASE_URL = (
-    f"mysql+pymysql://{settings.DATABASE_USER}:"
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL or (
+    f"mysql+aiomysql://{settings.DATABASE_USER}:"
     f"{settings.DATABASE_PASSWORD}@{settings.DATABASE_HOST}/"
     f"{settings.DATABASE_NAME}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+SYNC_DRIVERS = {
+    "aiomysql": "pymysql",
+    "asyncmy": "pymysql",
+    "aiosqlite": "pysqlite"
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "pymysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "pysqlite": "aiosqlite"
+}
 
-def get_db():
-    db = SessionLocal()
-    try:
+def sync_database_url(url: str):
+    parsed_url = make_url(url)
+    backend, _, driver = parsed_url.drivername.partition("+")
+    if driver in SYNC_DRIVERS:
+        parsed_url = parsed_url.set(drivername=f"{backend}+{SYNC_DRIVERS[driver]}")
+    return parsed_url
+
+def async_database_url(url: str):
+    parsed_url = make_url(url)
+    backend, _, driver = parsed_url.drivername.partition("+")
+    driver = driver or backend
+    if driver in ASYNC_DRIVERS:
+        parsed_url = parsed_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[driver]}")
+    return parsed_url
+
+def engine_options(url: str) -> dict:
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": True
+    }
+
+async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), **engine_options(SQLALCHEMY_DATABASE_URL))
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def create_sync_engine(**options):
+    # Only bulk loaders and maintenance tooling need a blocking engine; the
+    # application never opens one, so it is built on demand and owned by the caller.
+    return create_engine(sync_database_url(SQLALCHEMY_DATABASE_URL), **options)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
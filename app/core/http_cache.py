@@ -0,0 +1,53 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+from urllib.parse import urlencode
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+
+def make_etag(versions: List[str]) -> str:
+    return f'W/"{".".join(versions)}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque_tag for candidate in if_none_match.split(","))
+
+def cache_control_header() -> str:
+    return (
+        f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+        f"s-maxage={settings.HTTP_CACHE_SHARED_MAX_AGE}, "
+        f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+    )
+
+def check_not_modified(request: Request, response: Response, versions: Optional[List[str]]) -> Optional[Dict[str, str]]:
+    if versions is None:
+        return None
+
+    headers = {"ETag": make_etag(versions), "Cache-Control": cache_control_header()}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return headers
+
+def response_cache_key(request: Request, cache_headers: Optional[Dict[str, str]]) -> Optional[str]:
+    if cache_headers is None:
+        return None
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"response:{request.url.path}:{cache_headers['ETag']}:{query}"
+
+@lru_cache(maxsize=None)
+def json_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+def render_json(model: Type[BaseModel], content: Any) -> bytes:
+    adapter = json_adapter(model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+def json_response(body: bytes, cache_headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=cache_headers)
@@ -1,32 +1,146 @@
 from confluent_kafka import Producer
-import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 from app.config import settings
+from app.core.metrics import record_dependency
+
+logger = logging.getLogger(__name__)
+
+class KafkaTransport:
+    def __init__(self):
+        self.producer = Producer({
+            'bootstrap.servers': settings.KAFKA_BOOTSTRAP_SERVERS,
+            'enable.idempotence': True,
+            'linger.ms': settings.KAFKA_LINGER_MS,
+            'batch.num.messages': settings.KAFKA_BATCH_SIZE,
+            'queue.buffering.max.messages': settings.KAFKA_QUEUE_MAX_SIZE
+        })
+
+    def produce(self, topic: str, key: str, value: bytes, on_delivery: Callable) -> None:
+        self.producer.produce(topic, key=key, value=value, on_delivery=on_delivery)
+
+    def poll(self, timeout: float = 0) -> int:
+        return self.producer.poll(timeout)
+
+    def flush(self, timeout: float) -> int:
+        return self.producer.flush(timeout)
+
+class InMemoryMessage:
+    def __init__(self, topic: str, key: str, value: bytes):
+        self._topic = topic
+        self._key = key
+        self._value = value
+
+    def topic(self) -> str:
+        return self._topic
+
+    def key(self) -> bytes:
+        return self._key.encode('utf-8')
+
+    def value(self) -> bytes:
+        return self._value
+
+class InMemoryTransport:
+    def __init__(self):
+        self.messages: List[InMemoryMessage] = []
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def produce(self, topic: str, key: str, value: bytes, on_delivery: Callable) -> None:
+        with self.lock:
+            self.pending.append((InMemoryMessage(topic, key, value), on_delivery))
+
+    def poll(self, timeout: float = 0) -> int:
+        with self.lock:
+            delivered, self.pending = self.pending, []
+            self.messages.extend(message for message, _ in delivered)
+
+        for message, on_delivery in delivered:
+            on_delivery(None, message)
+        return len(delivered)
+
+    def flush(self, timeout: float) -> int:
+        self.poll(timeout)
+        return 0
+
+def create_transport():
+    if settings.KAFKA_TRANSPORT == 'memory':
+        return InMemoryTransport()
+    return KafkaTransport()
 
 class KafkaNotificationProducer:
     _instance = None
+    _instance_lock = threading.Lock()
 
-    def __new__(cls):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-            cls._instance.producer = Producer({
-                'bootstrap.servers': settings.KAFKA_BOOTSTRAP_SERVERS
-            })
+    def __new__(cls, transport=None):
+        with cls._instance_lock:
+            if not cls._instance:
+                cls._instance = super().__new__(cls)
+                cls._instance.setup(transport or create_transport())
         return cls._instance
 
-    def send_notification(self, user_id, message, notification_type, related_id=None):
-        notification_data = {
-            'user_id': user_id,
-            'message': message,
-            'type': notification_type,
-            'related_id': related_id
+    def setup(self, transport) -> None:
+        self.transport = transport
+        self.lock = threading.Lock()
+        self.stats = {
+            'delivered': 0,
+            'failed': 0,
+            'batches': 0
         }
-        
-        try:
-            self.producer.produce(
-                settings.KAFKA_NOTIFICATION_TOPIC, 
-                key=str(user_id),
-                value=json.dumps(notification_data).encode('utf-8')
-            )
-            self.producer.flush()
-        except Exception as e:
-            print(f"Kafka notification error: {e}")
\ No newline at end of file
+
+    def send_batch(self, messages: List[Tuple[str, str, bytes]], timeout: float) -> List[bool]:
+        results = [False] * len(messages)
+        started_at = time.perf_counter()
+
+        def delivery_callback(index):
+            def callback(err, message):
+                results[index] = err is None
+                self.on_delivery(err, message)
+            return callback
+
+        for index, (topic, key, value) in enumerate(messages):
+            for attempt in range(2):
+                try:
+                    self.transport.produce(topic, key=key, value=value, on_delivery=delivery_callback(index))
+                    break
+                except BufferError:
+                    self.transport.poll(0.1)
+                except Exception as e:
+                    logger.error("Kafka notification error: %s", e)
+                    break
+
+        self.transport.flush(timeout)
+        record_dependency("kafka", time.perf_counter() - started_at, len(messages))
+        with self.lock:
+            self.stats['batches'] += 1
+        return results
+
+    def on_delivery(self, err, message) -> None:
+        with self.lock:
+            if err is not None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['delivered'] += 1
+
+        if err is not None:
+            logger.error("Kafka delivery failed for %s: %s", message.topic(), err)
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        return self.transport.flush(settings.KAFKA_SHUTDOWN_FLUSH_TIMEOUT if timeout is None else timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.flush(timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._instance_lock:
+            instance, cls._instance = cls._instance, None
+
+        if instance is not None:
+            instance.close()
@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"
+DEPENDENCIES = ("db", "redis", "kafka")
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_LOG_LENGTH = 200
+
+class RequestMetrics:
+    __slots__ = ("started_at", "calls", "seconds", "statements")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.calls = dict.fromkeys(DEPENDENCIES, 0)
+        self.seconds = dict.fromkeys(DEPENDENCIES, 0.0)
+        self.statements = Counter()
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{dependency};dur={self.seconds[dependency] * 1000:.2f};desc="{self.calls[dependency]} calls"'
+            for dependency in DEPENDENCIES
+            if self.calls[dependency]
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started_at) * 1000:.2f}")
+        return ", ".join(entries)
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    return ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cache_entry_lifetimes: Dict[Tuple, float] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests: Dict[Tuple, int] = Counter()
+        self.request_buckets: Dict[Tuple, list] = defaultdict(lambda: [0] * len(REQUEST_DURATION_BUCKETS))
+        self.request_seconds: Dict[Tuple, float] = Counter()
+        self.request_count: Dict[Tuple, int] = Counter()
+        self.dependency_calls: Dict[Tuple, int] = Counter()
+        self.dependency_seconds: Dict[Tuple, float] = Counter()
+        self.cache_lookups: Dict[Tuple, int] = Counter()
+        self.cache_invalidations: Dict[Tuple, int] = Counter()
+        self.budget_exceeded: Dict[Tuple, int] = Counter()
+
+    def observe_request(self, method: str, route: str, status_code: int, elapsed: float, request_metrics: RequestMetrics) -> None:
+        with self.lock:
+            self.requests[(method, route, status_code)] += 1
+            buckets = self.request_buckets[(method, route)]
+            for index, bound in enumerate(REQUEST_DURATION_BUCKETS):
+                if elapsed <= bound:
+                    buckets[index] += 1
+            self.request_seconds[(method, route)] += elapsed
+            self.request_count[(method, route)] += 1
+
+            for dependency in DEPENDENCIES:
+                if request_metrics.calls[dependency]:
+                    self.dependency_calls[(dependency, route)] += request_metrics.calls[dependency]
+                    self.dependency_seconds[(dependency, route)] += request_metrics.seconds[dependency]
+
+    def observe_dependency(self, dependency: str, route: str, calls: int, elapsed: float) -> None:
+        with self.lock:
+            self.dependency_calls[(dependency, route)] += calls
+            self.dependency_seconds[(dependency, route)] += elapsed
+
+    def observe_cache(self, function: str, result: str, count: int) -> None:
+        with self.lock:
+            self.cache_lookups[(function, result)] += count
+
+    def observe_cache_invalidation(self, cache: str, count: int) -> None:
+        with self.lock:
+            self.cache_invalidations[(cache,)] += count
+
+    def set_cache_entry_lifetime(self, cache: str, seconds: float) -> None:
+        with self.lock:
+            self.cache_entry_lifetimes[(cache,)] = seconds
+
+    def observe_budget_exceeded(self, route: str) -> None:
+        with self.lock:
+            self.budget_exceeded[(route,)] += 1
+
+    def render(self) -> str:
+        lines = []
+
+        def family(name: str, metric_type: str, help_text: str, label_names: Tuple[str, ...], samples: Dict[Tuple, float]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for label_values, value in sorted(samples.items()):
+                lines.append(f"{name}{{{format_labels(label_names, label_values)}}} {value}")
+
+        with self.lock:
+            family("http_requests_total", "counter", "HTTP requests by route and status.", ("method", "route", "status"), self.requests)
+
+            lines.append("# HELP http_request_duration_seconds HTTP request latency by route.")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), buckets in sorted(self.request_buckets.items()):
+                labels = format_labels(("method", "route"), (method, route))
+                for bound, count in zip(REQUEST_DURATION_BUCKETS, buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {self.request_count[(method, route)]}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {self.request_seconds[(method, route)]}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {self.request_count[(method, route)]}")
+
+            family("dependency_calls_total", "counter", "SQL statements, Redis round trips and Kafka messages by route.", ("dependency", "route"), self.dependency_calls)
+            family("dependency_duration_seconds_total", "counter", "Time spent in SQL, Redis and Kafka by route.", ("dependency", "route"), self.dependency_seconds)
+            family("cache_lookups_total", "counter", "Cache lookups by function and result.", ("function", "result"), self.cache_lookups)
+            family("cache_invalidations_total", "counter", "Cache invalidations (generation bumps) by cache.", ("cache",), self.cache_invalidations)
+            family("cache_entry_lifetime_seconds", "gauge", "How long an entry, including one of an invalidated generation, stays in Redis: logical TTL plus the stale-serving window.", ("cache",), self.cache_entry_lifetimes)
+            family("sql_statement_budget_exceeded_total", "counter", "Requests that issued more SQL statements than the budget.", ("route",), self.budget_exceeded)
+
+        lines.append("")
+        return "\n".join(lines)
+
+registry = MetricsRegistry()
+
+def record_dependency(dependency: str, elapsed: float, calls: int = 1) -> Optional[RequestMetrics]:
+    request_metrics = _request_metrics.get()
+    if request_metrics is None:
+        registry.observe_dependency(dependency, BACKGROUND_ROUTE, calls, elapsed)
+        return None
+
+    request_metrics.calls[dependency] += calls
+    request_metrics.seconds[dependency] += elapsed
+    return request_metrics
+
+def record_cache(function: str, result: str, count: int = 1) -> None:
+    if count:
+        registry.observe_cache(function, result, count)
+
+def record_cache_invalidation(cache: str, count: int = 1) -> None:
+    if count:
+        registry.observe_cache_invalidation(cache, count)
+
+def set_cache_entry_lifetime(cache: str, seconds: float) -> None:
+    registry.set_cache_entry_lifetime(cache, seconds)
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context.metrics_started_at = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "metrics_started_at", None)
+    if started_at is None:
+        return
+
+    request_metrics = record_dependency("db", time.perf_counter() - started_at)
+    if request_metrics is not None:
+        request_metrics.statements[statement] += 1
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+def check_statement_budget(method: str, route: str, request_metrics: RequestMetrics) -> None:
+    budget = settings.METRICS_SQL_STATEMENT_BUDGET
+    if not budget or request_metrics.calls["db"] <= budget:
+        return
+
+    registry.observe_budget_exceeded(route)
+    statement, repeats = request_metrics.statements.most_common(1)[0]
+    logger.warning(
+        "%s %s issued %s SQL statements (budget %s); most repeated %sx: %s",
+        method, route, request_metrics.calls["db"], budget, repeats, " ".join(statement.split())[:STATEMENT_LOG_LENGTH]
+    )
+
+def route_template(scope) -> str:
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_metrics = RequestMetrics()
+        token = _request_metrics.set(request_metrics)
+        status_code = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.METRICS_SERVER_TIMING:
+                    MutableHeaders(scope=message).append("Server-Timing", request_metrics.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_metrics.reset(token)
+            route = route_template(scope)
+            registry.observe_request(scope["method"], route, status_code, time.perf_counter() - request_metrics.started_at, request_metrics)
+            check_statement_budget(scope["method"], route, request_metrics)
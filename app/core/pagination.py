@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    payload = json.dumps({"c": created_at.isoformat(), "i": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def apply_keyset(query, created_at_column, id_column, cursor: Optional[str]):
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                created_at_column < created_at,
+                and_(created_at_column == created_at, id_column < item_id)
+            )
+        )
+
+    return query
+
+def next_cursor_for(items: list, limit: int, created_at_getter, id_getter) -> Optional[str]:
+    if not items or len(items) < limit:
+        return None
+
+    last_item = items[-1]
+    created_at = created_at_getter(last_item)
+    if created_at is None:
+        return None
+
+    return encode_cursor(created_at, id_getter(last_item))
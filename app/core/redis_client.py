@@ -0,0 +1,96 @@
+import time
+import orjson
+import redis
+import redis.asyncio as aioredis
+from typing import Any, Dict, Iterable, List, Optional
+from app.config import settings
+from app.core.metrics import record_dependency
+
+_redis_client: Optional[redis.Redis] = None
+_async_redis_client: Optional[aioredis.Redis] = None
+
+def redis_connection_options() -> dict:
+    return {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "db": settings.REDIS_DB,
+        "password": settings.REDIS_PASSWORD,
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL
+    }
+
+class InstrumentedPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        started_at = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            record_dependency("redis", time.perf_counter() - started_at)
+
+class InstrumentedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            record_dependency("redis", time.perf_counter() - started_at)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+def create_redis_client() -> redis.Redis:
+    pool = redis.ConnectionPool(**redis_connection_options())
+    return redis.Redis(connection_pool=pool)
+
+def create_async_redis_client() -> aioredis.Redis:
+    pool = aioredis.ConnectionPool(**redis_connection_options())
+    client_class = InstrumentedRedis if settings.METRICS_ENABLED else aioredis.Redis
+    return client_class(connection_pool=pool)
+
+def get_redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = create_redis_client()
+    return _redis_client
+
+def get_async_redis() -> aioredis.Redis:
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = create_async_redis_client()
+    return _async_redis_client
+
+def set_redis_clients(sync_client: Optional[redis.Redis] = None, async_client: Optional[aioredis.Redis] = None) -> None:
+    global _redis_client, _async_redis_client
+    _redis_client = sync_client
+    _async_redis_client = async_client
+
+async def close_redis_clients() -> None:
+    global _redis_client, _async_redis_client
+    if _async_redis_client is not None:
+        await _async_redis_client.aclose()
+        _async_redis_client = None
+    if _redis_client is not None:
+        _redis_client.close()
+        _redis_client = None
+
+async def mget_json(keys: List[str]) -> List[Optional[Any]]:
+    if not keys:
+        return []
+    values = await get_async_redis().mget(keys)
+    return [orjson.loads(value) if value else None for value in values]
+
+async def setex_many_json(items: Dict[str, Any], ttl: int) -> None:
+    if not items:
+        return
+    pipe = get_async_redis().pipeline(transaction=False)
+    for key, value in items.items():
+        pipe.setex(key, ttl, orjson.dumps(value))
+    await pipe.execute()
+
+async def delete_many(keys: Iterable[str]) -> int:
+    keys = list(keys)
+    if not keys:
+        return 0
+    return await get_async_redis().delete(*keys)
@@ -0,0 +1,192 @@
+import functools
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have", "he",
+    "her", "his", "how", "i", "in", "is", "it", "its", "of", "on", "or", "she", "that", "the",
+    "their", "them", "they", "this", "to", "was", "we", "were", "what", "when", "which", "who",
+    "will", "with", "you", "your",
+    "ako", "ali", "bi", "bio", "bila", "bili", "bilo", "biti", "da", "do", "ga", "i", "ih", "ili",
+    "iz", "ja", "je", "jer", "jos", "ju", "kad", "kada", "kako", "koja", "koje", "koji", "kojih",
+    "kojima", "koju", "li", "me", "mi", "na", "nad", "ne", "nego", "nije", "nisu", "njega", "njih",
+    "o", "od", "pa", "po", "pod", "pri", "sa", "se", "si", "smo", "su", "sve", "svi", "ta", "taj",
+    "te", "ti", "to", "tu", "u", "uz", "vi", "za", "ze", "zbog"
+}
+
+SUFFIXES = sorted({
+    "ing", "edly", "ed", "ies", "es", "s", "ly", "ment", "ness",
+    "ama", "ima", "om", "em", "og", "ome", "omu", "oj", "ih", "im", "a", "e", "i", "o", "u",
+    "ovi", "ova", "ove", "ovima", "evi", "eva", "eve", "evima", "ski", "ska", "sko", "ske",
+    "ati", "iti", "jeti", "ala", "ali", "ila", "ili", "ao", "io"
+}, key=len, reverse=True)
+
+MIN_STEM_LENGTH = 3
+SNAPSHOT_CHUNK_TERMS = 1000
+
+def fold(text: str) -> str:
+    text = text.lower().replace("đ", "d")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(character for character in decomposed if not unicodedata.combining(character))
+
+def stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+@functools.lru_cache(maxsize=200000)
+def normalize_token(token: str) -> Optional[str]:
+    folded = fold(token)
+    if len(folded) < 2 or folded in STOPWORDS:
+        return None
+    return stem(folded)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [term for term in map(normalize_token, TOKEN_PATTERN.findall(text.lower())) if term]
+
+class InvertedIndex:
+    def __init__(self, title_boost: float = 2.5, k1: float = 1.2, b: float = 0.75, common_term_ratio: float = 0.1):
+        self.title_boost = title_boost
+        self.k1 = k1
+        self.b = b
+        self.common_term_ratio = common_term_ratio
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.doc_lengths: Dict[int, float] = {}
+        self.doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self.total_length = 0.0
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def weighted_terms(self, title: str, content: str) -> Tuple[Counter, float]:
+        title_terms = tokenize(title)
+        content_terms = tokenize(content)
+
+        frequencies = Counter()
+        for term in title_terms:
+            frequencies[term] += self.title_boost
+        for term in content_terms:
+            frequencies[term] += 1
+
+        return frequencies, len(title_terms) * self.title_boost + len(content_terms)
+
+    def add(self, doc_id: int, title: str, content: str) -> None:
+        frequencies, length = self.weighted_terms(title, content)
+
+        with self.lock:
+            self.remove(doc_id)
+            for term, frequency in frequencies.items():
+                self.postings.setdefault(term, {})[doc_id] = frequency
+            self.doc_terms[doc_id] = tuple(frequencies)
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+
+    def add_many(self, documents: Iterable[Tuple[int, str, str]]) -> int:
+        count = 0
+        for doc_id, title, content in documents:
+            self.add(doc_id, title, content)
+            count += 1
+        return count
+
+    def remove(self, doc_id: int) -> None:
+        with self.lock:
+            terms = self.doc_terms.pop(doc_id, None)
+            if terms is None:
+                return
+
+            for term in terms:
+                documents = self.postings.get(term)
+                if documents is not None:
+                    documents.pop(doc_id, None)
+                    if not documents:
+                        del self.postings[term]
+            self.total_length -= self.doc_lengths.pop(doc_id, 0.0)
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> Tuple[List[Tuple[int, float]], int]:
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return [], 0
+
+        with self.lock:
+            document_count = len(self.doc_lengths)
+            if not document_count:
+                return [], 0
+
+            average_length = self.total_length / document_count or 1.0
+            k1 = self.k1
+            b = self.b
+            doc_lengths = self.doc_lengths
+            scores: Dict[int, float] = {}
+
+            term_postings = sorted(
+                (self.postings[term] for term in query_terms if term in self.postings),
+                key=len
+            )
+            common_threshold = document_count * self.common_term_ratio
+            for documents in term_postings:
+                document_frequency = len(documents)
+                idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+                if scores and document_frequency > common_threshold:
+                    # Common terms only re-rank documents already matched by rarer ones.
+                    matches = ((doc_id, documents[doc_id]) for doc_id in list(scores) if doc_id in documents)
+                else:
+                    matches = documents.items()
+
+                for doc_id, frequency in matches:
+                    norm = k1 * (1 - b + b * doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return ranked[offset:], len(scores)
+
+    def snapshot(self, chunk_size: int = SNAPSHOT_CHUNK_TERMS) -> Dict[str, Any]:
+        with self.lock:
+            doc_lengths = dict(self.doc_lengths)
+            terms = list(self.postings)
+
+        # Postings are copied a chunk of terms at a time so writers never wait
+        # for the whole index. A document changed meanwhile may be captured
+        # partially; it is newer than the snapshot and re-indexed on load.
+        postings = {}
+        for chunk_start in range(0, len(terms), chunk_size):
+            with self.lock:
+                for term in terms[chunk_start:chunk_start + chunk_size]:
+                    documents = self.postings.get(term)
+                    if documents is not None:
+                        postings[term] = [list(documents), list(documents.values())]
+
+        return {
+            "title_boost": self.title_boost,
+            "doc_ids": list(doc_lengths),
+            "doc_lengths": list(doc_lengths.values()),
+            "postings": postings
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any], **options) -> "InvertedIndex":
+        index = cls(title_boost=state["title_boost"], **options)
+        index.doc_lengths = dict(zip(state["doc_ids"], state["doc_lengths"]))
+        index.total_length = sum(index.doc_lengths.values())
+
+        doc_terms: Dict[int, List[str]] = {doc_id: [] for doc_id in index.doc_lengths}
+        for term, (doc_ids, frequencies) in state["postings"].items():
+            documents = {doc_id: frequency for doc_id, frequency in zip(doc_ids, frequencies) if doc_id in doc_terms}
+            if not documents:
+                continue
+            index.postings[term] = documents
+            for doc_id in documents:
+                doc_terms[doc_id].append(term)
+        index.doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+        return index
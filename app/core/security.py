@@ -1,22 +1,32 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import time
 import jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.schemas.user import TokenData
-from app.models.user import UserRole
+from app.core.broadcast import publish, subscribe
+from app.core.database import get_db
+from app.core.ttl_cache import TTLCache
+from app.core.password_hashing import pwd_context, hash_password_sync, verify_password_sync
+from app.schemas.user import TokenData, UserRecord
+from app.models.user import User, UserRole
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_cache = TTLCache(settings.TOKEN_CACHE_MAX_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+user_cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL)
+
+USER_RECORD_CHANNEL = "users:records"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_password_sync(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password_sync(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -37,6 +47,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 def decode_token(token: str):
+    cached_token_data = token_cache.get(token)
+    if cached_token_data is not None:
+        return cached_token_data
+    
     try:
         payload = jwt.decode(
             token, 
@@ -53,7 +67,12 @@ def decode_token(token: str):
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        return TokenData(username=username, role=role)
+        token_data = TokenData(username=username, role=role, user_id=payload.get("uid"))
+        
+        expires_at = payload.get("exp")
+        token_cache.set(token, token_data, ttl=expires_at - time.time() if expires_at else None)
+        
+        return token_data
     except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,12 +83,47 @@ def decode_token(token: str):
 def get_current_user(token: str = Depends(oauth2_scheme)):
     return decode_token(token)
 
+def credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+async def get_current_user_record(
+    token_data: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> UserRecord:
+    if token_data.user_id is not None:
+        cached_record = user_cache.get(token_data.user_id)
+        if cached_record is not None:
+            return cached_record
+        user = await db.scalar(select(User).where(User.id == token_data.user_id))
+    else:
+        user = await db.scalar(select(User).where(User.username == token_data.username))
+    
+    if not user:
+        raise credentials_exception()
+    
+    user_record = UserRecord.model_validate(user)
+    user_cache.set(user_record.id, user_record)
+    return user_record
+
+def drop_user_record(event: dict) -> None:
+    user_cache.pop(event["user_id"])
+
+async def invalidate_user_record(user_id: int) -> None:
+    user_cache.pop(user_id)
+    await publish(USER_RECORD_CHANNEL, {"user_id": user_id})
+
+subscribe(USER_RECORD_CHANNEL, drop_user_record)
+
 def require_role(required_role: UserRole):
-    def role_checker(token_data: TokenData = Depends(get_current_user)):
-        if token_data.role != required_role:
+    def role_checker(user: UserRecord = Depends(get_current_user_record)):
+        if user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to perform this action"
             )
-        return token_data
-    return role_checker
\ No newline at end of file
+        return user
+    return role_checker
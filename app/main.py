@@ -1,15 +1,56 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from app.api import auth
-from app.core.database import engine
-from app.models.user import Base
-from app.models.post import Post
-from app.models.category import Category
-from app.api import posts, comments, categories, bookmarks
-from app.models.notification import Notification
+from app.core.database import async_engine
+from app.core.redis_client import close_redis_clients
+from app.core.kafka_producer import KafkaNotificationProducer
+from app.core.password_hashing import shutdown_executor
+from app import models
+from app.api import posts, comments, categories, bookmarks, notifications, follows, feed
+from app.config import settings
+from app.services.outbox_service import OutboxRelay
+from app.services.category_service import CategoryCatalogLoader
+from app.services.search_service import SearchIndexer
+from app.services.timeline_service import feed_fanout
+from app.services.trending_service import TrendingCompactor
+from app.core.broadcast import BroadcastListener
+from app.core.metrics import MetricsMiddleware, PROMETHEUS_CONTENT_TYPE, instrument_engine, registry
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    outbox_relay = OutboxRelay()
+    search_indexer = SearchIndexer()
+    category_catalog_loader = CategoryCatalogLoader()
+    broadcast_listener = BroadcastListener()
+    trending_compactor = TrendingCompactor()
+    if settings.OUTBOX_RELAY_ENABLED:
+        outbox_relay.start()
+    if settings.SEARCH_ENABLED:
+        search_indexer.start()
+    if settings.CATEGORY_CATALOG_ENABLED:
+        category_catalog_loader.start()
+    broadcast_listener.start()
+    feed_fanout.start()
+    trending_compactor.start()
+    yield
+    await trending_compactor.stop()
+    await feed_fanout.stop()
+    await broadcast_listener.stop()
+    await category_catalog_loader.stop()
+    await search_indexer.stop()
+    await outbox_relay.stop()
+    await run_in_threadpool(KafkaNotificationProducer.shutdown)
+    await run_in_threadpool(shutdown_executor)
+    await close_redis_clients()
+    await async_engine.dispose()
 
-app = FastAPI(title="Blog API")
+app = FastAPI(title="Blog API", lifespan=lifespan)
+
+if settings.METRICS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
@@ -21,8 +62,18 @@ app.include_router(comments.router, prefix="/comments", tags=["Comments"])
 
 app.include_router(bookmarks.router, prefix="/bookmarks", tags=["Bookmarks"])
 
+app.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
+
+app.include_router(follows.router, prefix="/follows", tags=["Follows"])
+
+app.include_router(feed.router, prefix="/feed", tags=["Feed"])
+
 @app.get("/")
 def read_root():
     return {
         "Poruka": "Blog API je pokrenut",
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
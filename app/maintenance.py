@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.redis_client import close_redis_clients
+from app.services.counter_service import rebuild_counters
+from app.services.post_service import RECOMPUTE_BATCH_SIZE, recompute_likes_counts
+
+async def recompute_likes(db: AsyncSession, args: argparse.Namespace) -> Dict[str, Any]:
+    corrected = await recompute_likes_counts(db, args.first_post_id, args.last_post_id, args.batch_size)
+    return {"corrected_posts": corrected}
+
+async def rebuild(db: AsyncSession, args: argparse.Namespace) -> Dict[str, Any]:
+    return {"counters": await rebuild_counters(db)}
+
+async def run(command: Callable[[AsyncSession, argparse.Namespace], Awaitable[Dict[str, Any]]], args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await command(db, args)
+    finally:
+        await close_redis_clients()
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Operator maintenance commands against the configured database and Redis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    likes_parser = commands.add_parser("recompute-likes", help="recount likes_count from post_likes and invalidate corrected posts")
+    likes_parser.add_argument("--first-post-id", type=int, default=None)
+    likes_parser.add_argument("--last-post-id", type=int, default=None)
+    likes_parser.add_argument("--batch-size", type=int, default=RECOMPUTE_BATCH_SIZE)
+    likes_parser.set_defaults(handler=recompute_likes)
+
+    counters_parser = commands.add_parser("rebuild-counters", help="recompute every row of the counters table from the source tables")
+    counters_parser.set_defaults(handler=rebuild)
+
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.handler, args)), indent=2))
@@ -0,0 +1,10 @@
+from app.models.base import Base
+from app.models.user import User, UserRole
+from app.models.category import Category
+from app.models.post import Post, post_likes
+from app.models.comment import Comment
+from app.models.bookmark import Bookmark
+from app.models.notification import Notification
+from app.models.counter import Counter
+from app.models.outbox import OutboxEvent
+from app.models.follow import AuthorFollow, CategoryFollow
@@ -0,0 +1,10 @@
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+# SQLite keeps server-side CURRENT_TIMESTAMP values without fractional seconds
+# and compares timestamps as strings, so every value is written and bound the
+# same way there.
+Timestamp = DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
@@ -1,18 +1,22 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.models.user import Base, User
+from app.models.base import Base, Timestamp
+from app.models.user import User
 from app.models.post import Post
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
+    __table_args__ = (
+        Index('uq_bookmarks_user_post', 'user_id', 'post_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     post_id = Column(Integer, ForeignKey('posts.id'), nullable=False)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
     user = relationship("User", back_populates="bookmarks")
     post = relationship("Post", back_populates="bookmarkers")
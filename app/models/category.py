@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
-from app.models.user import Base
+from app.models.base import Base
 
 class Category(Base):
     __tablename__ = "categories"
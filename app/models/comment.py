@@ -1,19 +1,31 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.models.user import Base, User
+from app.models.base import Base, Timestamp
+from app.models.user import User
 from app.models.post import Post
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index('ix_comments_post_created', 'post_id', 'created_at'),
+        Index('ix_comments_post_path', 'post_id', 'path'),
+        Index('ix_comments_post_depth_created', 'post_id', 'depth', 'created_at'),
+        Index('ix_comments_root_path', 'root_id', 'path'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     post_id = Column(Integer, ForeignKey('posts.id'), nullable=False)
     author_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     
+    parent_id = Column(Integer, nullable=True, index=True)
+    root_id = Column(Integer, nullable=True)
+    depth = Column(Integer, nullable=False, default=0, server_default='0')
+    path = Column(String(255), nullable=True)
+    
     post = relationship("Post", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, BigInteger
+from app.models.base import Base
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f"<Counter {self.name}={self.value}>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.models.base import Base, Timestamp
+
+class AuthorFollow(Base):
+    __tablename__ = "author_follows"
+    __table_args__ = (
+        Index('ix_author_follows_author_follower', 'author_id', 'follower_id'),
+    )
+
+    follower_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    author_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    created_at = Column(Timestamp, server_default=func.now())
+
+    def __repr__(self):
+        return f"<AuthorFollow User {self.follower_id} -> User {self.author_id}>"
+
+class CategoryFollow(Base):
+    __tablename__ = "category_follows"
+    __table_args__ = (
+        Index('ix_category_follows_category_follower', 'category_id', 'follower_id'),
+    )
+
+    follower_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    category_id = Column(Integer, ForeignKey('categories.id'), primary_key=True)
+    created_at = Column(Timestamp, server_default=func.now())
+
+    def __repr__(self):
+        return f"<CategoryFollow User {self.follower_id} -> Category {self.category_id}>"
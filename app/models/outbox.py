@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, Index
+from sqlalchemy.sql import func
+from app.models.base import Base, Timestamp
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index('ix_outbox_events_key_id', 'message_key', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic = Column(String(255), nullable=False)
+    message_key = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    created_at = Column(Timestamp, server_default=func.now())
+    dead_lettered_at = Column(Timestamp, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.topic}:{self.message_key}>"
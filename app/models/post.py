@@ -1,21 +1,29 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.models.user import Base, User
+from app.models.base import Base, Timestamp
+from app.models.user import User
 
 post_likes = Table('post_likes', Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True)
+    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True),
+    Index('ix_post_likes_post_id', 'post_id')
 )
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index('ix_posts_created_at', 'created_at'),
+        Index('ix_posts_category_created', 'category_id', 'created_at'),
+        Index('ix_posts_author_created', 'author_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    likes_count = Column(Integer, nullable=False, default=0, server_default='0')
     
     author_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     category_id = Column(Integer, ForeignKey('categories.id'), nullable=True)
@@ -29,10 +37,6 @@ class Post(Base):
         back_populates="liked_posts"
     )
 
-    @property
-    def likes_count(self):
-        return len(self.likers)
-    
     def __repr__(self):
         category_info = f" in category {self.category_id}" if self.category_id else ""
         return f"<Post {self.title} by User {self.author_id}{category_info}>"
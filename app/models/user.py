@@ -1,10 +1,8 @@
 from sqlalchemy import Column, Integer, String, Enum
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from app.models.base import Base
 import enum
 
-Base = declarative_base()
-
 class UserRole(enum.Enum):
     USER = "user"
     ADMIN = "admin"
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 class BookmarkBase(BaseModel):
     post_id: int
@@ -19,4 +19,5 @@ class BookmarkResponse(BookmarkBase):
 
 class BookmarkListResponse(BaseModel):
     bookmarks: List[BookmarkResponse]
-    total: int
\ No newline at end of file
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -17,4 +17,4 @@ class CategoryResponse(CategoryBase):
 
 class CategoryListResponse(BaseModel):
     categories: List[CategoryResponse]
-    total: int
\ No newline at end of file
+    total: Optional[int] = None
\ No newline at end of file
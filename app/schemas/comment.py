@@ -1,18 +1,21 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class CommentBase(BaseModel):
     content: str = Field(..., min_length=1, max_length=1000, description="Content of the comment")
 
 class CommentCreate(CommentBase):
-    pass
+    parent_id: Optional[int] = Field(None, description="Optional ID of the comment being replied to")
 
 class CommentResponse(CommentBase):
     id: int
     post_id: int
     author_id: int
     created_at: datetime
+    parent_id: Optional[int] = None
+    root_id: Optional[int] = None
+    depth: int = 0
 
     class Config:
         orm_mode = True
@@ -22,4 +25,18 @@ class CommentResponse(CommentBase):
 
 class CommentListResponse(BaseModel):
     comments: list[CommentResponse]
-    total: int
\ No newline at end of file
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class CommentThreadResponse(BaseModel):
+    comment: CommentResponse
+    replies: List[CommentResponse]
+    reply_count: int
+
+class CommentThreadListResponse(BaseModel):
+    threads: List[CommentThreadResponse]
+    next_cursor: Optional[str] = None
+
+class CommentSubtreeResponse(BaseModel):
+    comments: List[CommentResponse]
+    truncated: bool = False
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from app.schemas.post import PostResponse
+
+class FollowResponse(BaseModel):
+    followers: int
+
+class FollowListResponse(BaseModel):
+    authors: List[int] = []
+    categories: List[int] = []
+
+class FeedResponse(BaseModel):
+    posts: List[PostResponse]
+    next_cursor: Optional[str] = None
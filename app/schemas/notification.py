@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class NotificationResponse(BaseModel):
+    id: int
+    user_id: int
+    content: str
+    notification_type: str
+    related_id: Optional[int] = None
+    is_read: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class NotificationListResponse(BaseModel):
+    notifications: List[NotificationResponse]
+    unread: int
+    next_cursor: Optional[str] = None
+
+class UnreadCountResponse(BaseModel):
+    unread: int
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None
+
+class NotificationMarkReadResponse(BaseModel):
+    updated: int
+    unread: int
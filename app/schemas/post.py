@@ -33,9 +33,27 @@ class PostResponse(PostBase):
         }
 
 class PostListResponse(BaseModel):
+    posts: List[PostResponse]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class PostBatchResponse(BaseModel):
+    posts: List[PostResponse]
+    missing: List[int] = []
+
+class PostSearchResponse(BaseModel):
     posts: List[PostResponse]
     total: int
 
+class PostTrendingResponse(BaseModel):
+    posts: List[PostResponse]
+
+class PostBulkCreate(BaseModel):
+    posts: List[PostCreate] = Field(..., min_length=1, max_length=1000, description="Posts to create in one batch")
+
+class PostBulkCreateResponse(BaseModel):
+    created: int
+
 class PostFilter(BaseModel):
     category_id: Optional[int] = None
     author_id: Optional[int] = None
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
 from app.models.user import UserRole
 
 class UserBase(BaseModel):
@@ -16,9 +17,21 @@ class UserResponse(UserBase):
     class Config:
         orm_mode = True
 
+class UserRoleUpdate(BaseModel):
+    role: UserRole
+
+class UserRecord(BaseModel):
+    id: int
+    username: str
+    role: UserRole
+
+    class Config:
+        from_attributes = True
+
 class TokenData(BaseModel):
     username: str = None
     role: UserRole = None
+    user_id: Optional[int] = None
 
 class Token(BaseModel):
     access_token: str
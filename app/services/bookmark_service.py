@@ -1,24 +1,30 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from typing import List, Dict, Optional
 
 from app.models.bookmark import Bookmark
 from app.models.post import Post
 from app.schemas.bookmark import BookmarkCreate, BookmarkResponse
+from app.core.pagination import apply_keyset, next_cursor_for
+from app.services.counter_service import bookmarks_by_user_key, increment_counter, get_counter
+from app.services.trending_service import record_engagement
 from fastapi import HTTPException, status
 
-def create_bookmark(db: Session, bookmark: BookmarkCreate, user_id: int) -> BookmarkResponse:
-    post = db.query(Post).filter(Post.id == bookmark.post_id).first()
+async def create_bookmark(db: AsyncSession, bookmark: BookmarkCreate, user_id: int) -> BookmarkResponse:
+    post = (await db.execute(select(Post.id, Post.title, Post.category_id).where(Post.id == bookmark.post_id))).first()
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Post not found"
         )
     
-    existing_bookmark = db.query(Bookmark).filter(
-        Bookmark.user_id == user_id, 
-        Bookmark.post_id == bookmark.post_id
-    ).first()
+    existing_bookmark = await db.scalar(
+        select(Bookmark.id).where(
+            Bookmark.user_id == user_id, 
+            Bookmark.post_id == bookmark.post_id
+        )
+    )
     
     if existing_bookmark:
         raise HTTPException(
@@ -33,8 +39,11 @@ def create_bookmark(db: Session, bookmark: BookmarkCreate, user_id: int) -> Book
     
     try:
         db.add(new_bookmark)
-        db.commit()
-        db.refresh(new_bookmark)
+        await increment_counter(db, bookmarks_by_user_key(user_id))
+        await db.commit()
+        await db.refresh(new_bookmark)
+        
+        await record_engagement(bookmark.post_id, post.category_id, "bookmark")
         
         return BookmarkResponse(
             id=new_bookmark.id,
@@ -44,28 +53,33 @@ def create_bookmark(db: Session, bookmark: BookmarkCreate, user_id: int) -> Book
             post_title=post.title
         )
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Could not create bookmark"
         )
 
-def list_user_bookmarks(db: Session, user_id: int, skip: int = 0, limit: int = 10) -> Dict[str, List[BookmarkResponse]]:
+async def list_user_bookmarks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = True) -> Dict[str, List[BookmarkResponse]]:
     query = (
-        db.query(Bookmark, Post.title)
+        select(Bookmark, Post.title)
         .join(Post)
-        .filter(Bookmark.user_id == user_id)
-        .order_by(Bookmark.created_at.desc())
+        .where(Bookmark.user_id == user_id)
     )
     
-    total = query.count()
+    total = None
+    if include_total:
+        total = await get_counter(db, bookmarks_by_user_key(user_id))
+        if total is None:
+            total = await db.scalar(select(func.count(Bookmark.id)).where(Bookmark.user_id == user_id))
     
-    bookmarks_with_titles = (
-        query
+    if cursor:
+        skip = 0
+    
+    bookmarks_with_titles = (await db.execute(
+        apply_keyset(query, Bookmark.created_at, Bookmark.id, cursor)
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).all()
     
     bookmarks = [
         BookmarkResponse(
@@ -79,11 +93,12 @@ def list_user_bookmarks(db: Session, user_id: int, skip: int = 0, limit: int = 1
     
     return {
         "bookmarks": bookmarks,
-        "total": total
+        "total": total,
+        "next_cursor": next_cursor_for(bookmarks, limit, lambda bookmark: bookmark.created_at, lambda bookmark: bookmark.id)
     }
 
-def get_bookmark_by_id(db: Session, bookmark_id: int) -> Bookmark:
-    bookmark = db.query(Bookmark).filter(Bookmark.id == bookmark_id).first()
+async def get_bookmark_by_id(db: AsyncSession, bookmark_id: int) -> Bookmark:
+    bookmark = await db.scalar(select(Bookmark).where(Bookmark.id == bookmark_id))
     
     if not bookmark:
         raise HTTPException(
@@ -93,8 +108,9 @@ def get_bookmark_by_id(db: Session, bookmark_id: int) -> Bookmark:
     
     return bookmark
 
-def delete_bookmark(db: Session, bookmark_id: int):
-    bookmark = get_bookmark_by_id(db, bookmark_id)
+async def delete_bookmark(db: AsyncSession, bookmark_id: int):
+    bookmark = await get_bookmark_by_id(db, bookmark_id)
     
-    db.delete(bookmark)
-    db.commit()
\ No newline at end of file
+    await increment_counter(db, bookmarks_by_user_key(bookmark.user_id), -1)
+    await db.delete(bookmark)
+    await db.commit()
\ No newline at end of file
@@ -1,15 +1,142 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select
+from app.config import settings
+from app.core.broadcast import publish, subscribe
+from app.core.category_catalog import CategoryCatalog
+from app.core.database import AsyncSessionLocal
 from app.models.category import Category
+from app.models.follow import CategoryFollow
 from app.models.post import Post
 from app.schemas.category import CategoryCreate, CategoryResponse
+from app.services.counter_service import (
+    CATEGORIES_TOTAL,
+    CATEGORY_CATALOG_SEQUENCE,
+    posts_by_category_key,
+    post_count_sequence_key,
+    followers_by_category_key,
+    increment_counter,
+    get_counter,
+    get_counters,
+    delete_counters
+)
+from app.services.redis_cache_service import bump_categories_info_version, bump_categories_version, invalidate_posts_list_cache
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-def create_category(db: Session, category: CategoryCreate) -> Category:
-    existing_category = db.query(Category).filter(
-        func.lower(Category.name) == func.lower(category.name)
-    ).first()
+logger = logging.getLogger(__name__)
+
+CATEGORY_CATALOG_CHANNEL = "categories:catalog"
+
+category_catalog: Optional[CategoryCatalog] = None
+_pending_events: Optional[List[Dict[str, Any]]] = None
+
+def get_category_catalog() -> Optional[CategoryCatalog]:
+    return category_catalog
+
+def apply_event_to(catalog: CategoryCatalog, event: Dict[str, Any]) -> None:
+    # Events committed before the catalog's snapshot was read are already in it.
+    if event.get("sequence") is not None and event["sequence"] <= catalog.sequence:
+        return
+
+    if event["op"] == "upsert":
+        catalog.upsert_many(event["categories"])
+    elif event["op"] == "delete":
+        for category_id in event["ids"]:
+            catalog.remove(category_id)
+    elif event["op"] == "post_counts":
+        catalog.adjust_post_counts(event["deltas"])
+
+def apply_catalog_event(event: Dict[str, Any]) -> None:
+    if _pending_events is not None:
+        _pending_events.append(event)
+    if category_catalog is not None:
+        apply_event_to(category_catalog, event)
+
+async def publish_catalog_event(event: Dict[str, Any]) -> None:
+    apply_catalog_event(event)
+    await publish(CATEGORY_CATALOG_CHANNEL, event)
+
+async def next_catalog_sequence(db: AsyncSession) -> int:
+    await increment_counter(db, CATEGORY_CATALOG_SEQUENCE)
+    return await get_counter(db, CATEGORY_CATALOG_SEQUENCE)
+
+async def catalog_upsert(category: Category, sequence: int) -> None:
+    await publish_catalog_event({
+        "op": "upsert",
+        "categories": [(category.id, category.name, category.description)],
+        "sequence": sequence
+    })
+
+async def count_category_posts(db: AsyncSession, deltas: Dict[Optional[int], int]) -> Dict[int, int]:
+    # Count changes are ordered per category, so post writes in different
+    # categories never queue on a shared row. Sorted ids keep lock order stable.
+    sequences = {}
+    for category_id in sorted(category_id for category_id, delta in deltas.items() if category_id is not None and delta):
+        await increment_counter(db, posts_by_category_key(category_id), deltas[category_id])
+        await increment_counter(db, post_count_sequence_key(category_id))
+        sequences[category_id] = await get_counter(db, post_count_sequence_key(category_id))
+    return sequences
+
+async def adjust_category_post_counts(deltas: Dict[Optional[int], int], sequences: Dict[int, int]) -> None:
+    deltas = [(category_id, deltas[category_id], sequence) for category_id, sequence in sequences.items()]
+    if not deltas:
+        return
+
+    await publish_catalog_event({"op": "post_counts", "deltas": deltas})
+    await bump_categories_version()
+
+async def load_category_catalog(db: AsyncSession) -> CategoryCatalog:
+    global category_catalog, _pending_events
+
+    _pending_events = []
+    try:
+        categories = (await db.execute(select(Category.id, Category.name, Category.description))).all()
+        post_counts = await get_counters(db, [
+            CATEGORY_CATALOG_SEQUENCE,
+            *[posts_by_category_key(category_id) for category_id, _, _ in categories],
+            *[post_count_sequence_key(category_id) for category_id, _, _ in categories]
+        ])
+        catalog = CategoryCatalog(
+            sequence=post_counts.get(CATEGORY_CATALOG_SEQUENCE, 0),
+            post_count_sequences={
+                category_id: post_counts.get(post_count_sequence_key(category_id), 0)
+                for category_id, _, _ in categories
+            }
+        )
+        catalog.upsert_many(
+            (category_id, name, description, post_counts.get(posts_by_category_key(category_id), 0))
+            for category_id, name, description in categories
+        )
+
+        for event in _pending_events:
+            apply_event_to(catalog, event)
+        category_catalog = catalog
+    finally:
+        _pending_events = None
+
+    return catalog
+
+async def ensure_categories_exist(db: AsyncSession, category_ids: Iterable[int]) -> None:
+    category_ids = set(category_ids)
+    if category_catalog is not None:
+        category_ids = set(category_catalog.missing(category_ids))
+    if not category_ids:
+        return
+
+    existing_category_ids = set(await db.scalars(select(Category.id).where(Category.id.in_(category_ids))))
+    if category_ids - existing_category_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found"
+        )
+
+async def ensure_category_exists(db: AsyncSession, category_id: int) -> None:
+    await ensure_categories_exist(db, [category_id])
+
+async def create_category(db: AsyncSession, category: CategoryCreate) -> Category:
+    existing_category = await get_category_by_name(db, category.name)
 
     if existing_category:
         raise HTTPException(
@@ -23,13 +150,33 @@ def create_category(db: Session, category: CategoryCreate) -> Category:
     )
 
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await increment_counter(db, CATEGORIES_TOTAL)
+    catalog_sequence = await next_catalog_sequence(db)
+    await db.commit()
+    await db.refresh(db_category)
+    
+    await catalog_upsert(db_category, catalog_sequence)
+    await bump_categories_version()
     return db_category
 
 
-def get_category_by_id(db: Session, category_id: int) -> Optional[Category]:
-    category = db.query(Category).filter(Category.id == category_id).first()
+async def get_category(db: AsyncSession, category_id: int) -> Dict[str, Any]:
+    if category_catalog is not None:
+        category = category_catalog.get(category_id)
+        if category is not None:
+            return category
+
+    db_category = await get_category_by_id(db, category_id)
+    return {
+        "id": db_category.id,
+        "name": db_category.name,
+        "description": db_category.description,
+        "post_count": await get_counter(db, posts_by_category_key(category_id)) or 0
+    }
+
+
+async def get_category_by_id(db: AsyncSession, category_id: int) -> Optional[Category]:
+    category = await db.scalar(select(Category).where(Category.id == category_id))
     
     if not category:
         raise HTTPException(
@@ -40,37 +187,47 @@ def get_category_by_id(db: Session, category_id: int) -> Optional[Category]:
     return category
 
 
-def get_category_by_name(db: Session, category_name: str) -> Optional[Category]:
-    return db.query(Category).filter(
-        func.lower(Category.name) == func.lower(category_name)
-    ).first()
+async def get_category_by_name(db: AsyncSession, category_name: str) -> Optional[Category]:
+    return await db.scalar(
+        select(Category).where(func.lower(Category.name) == func.lower(category_name))
+    )
 
 
-def list_categories(db: Session, skip: int = 0, limit: int = 10) -> dict:
-    query = db.query(Category, func.count(Post.id).label('post_count')) \
-        .outerjoin(Post, Category.id == Post.category_id) \
-        .group_by(Category.id)
+async def list_categories(db: AsyncSession, skip: int = 0, limit: int = 10, include_total: bool = True) -> dict:
+    if category_catalog is not None:
+        return {
+            "categories": category_catalog.page(skip, limit),
+            "total": len(category_catalog) if include_total else None
+        }
 
-    total = query.count()
+    total = None
+    if include_total:
+        total = await get_counter(db, CATEGORIES_TOTAL)
+        if total is None:
+            total = await db.scalar(select(func.count(Category.id)))
     
-    categories_with_count = query.offset(skip).limit(limit).all()
+    page = list(await db.scalars(select(Category).order_by(Category.id).offset(skip).limit(limit)))
+    post_counts = await get_counters(db, [posts_by_category_key(category.id) for category in page])
     
-    categories = []
-    for category, post_count in categories_with_count:
-        category_dict = category.__dict__.copy()
-        category_dict['post_count'] = post_count
-        categories.append(category_dict)
+    categories = [
+        {
+            "id": category.id,
+            "name": category.name,
+            "description": category.description,
+            "post_count": post_counts.get(posts_by_category_key(category.id), 0)
+        } for category in page
+    ]
 
     return {
         "categories": categories,
         "total": total
     }
 
-def update_category(db: Session, category_id: int, category_update: CategoryCreate) -> Category:
-    db_category = get_category_by_id(db, category_id)
+async def update_category(db: AsyncSession, category_id: int, category_update: CategoryCreate) -> Category:
+    db_category = await get_category_by_id(db, category_id)
 
     if category_update.name.lower() != db_category.name.lower():
-        existing_category = get_category_by_name(db, category_update.name)
+        existing_category = await get_category_by_name(db, category_update.name)
         if existing_category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,22 +237,68 @@ def update_category(db: Session, category_id: int, category_update: CategoryCrea
     db_category.name = category_update.name
     db_category.description = category_update.description
 
-    db.commit()
-    db.refresh(db_category)
+    catalog_sequence = await next_catalog_sequence(db)
+    await db.commit()
+    await db.refresh(db_category)
+    
+    await catalog_upsert(db_category, catalog_sequence)
+    await bump_categories_info_version()
+    await invalidate_posts_list_cache()
     return db_category
 
 
-def delete_category(db: Session, category_id: int) -> bool:
-    db_category = get_category_by_id(db, category_id)
+async def delete_category(db: AsyncSession, category_id: int) -> bool:
+    db_category = await get_category_by_id(db, category_id)
 
-    post_count = db.query(Post).filter(Post.category_id == category_id).count()
+    has_posts = await db.scalar(select(Post.id).where(Post.category_id == category_id).limit(1))
     
-    if post_count > 0:
+    if has_posts:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete category with existing posts"
         )
 
-    db.delete(db_category)
-    db.commit()
-    return True
\ No newline at end of file
+    await increment_counter(db, CATEGORIES_TOTAL, -1)
+    await delete_counters(db, [
+        posts_by_category_key(category_id),
+        post_count_sequence_key(category_id),
+        followers_by_category_key(category_id)
+    ])
+    await db.execute(delete(CategoryFollow).where(CategoryFollow.category_id == category_id).execution_options(synchronize_session=False))
+    await db.delete(db_category)
+    catalog_sequence = await next_catalog_sequence(db)
+    await db.commit()
+    
+    await publish_catalog_event({"op": "delete", "ids": [category_id], "sequence": catalog_sequence})
+    await bump_categories_version()
+    return True
+
+class CategoryCatalogLoader:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self.task is None:
+            subscribe(CATEGORY_CATALOG_CHANNEL, apply_catalog_event)
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as db:
+                    catalog = await load_category_catalog(db)
+                logger.debug("Category catalog loaded with %s categories", len(catalog))
+            except Exception as e:
+                logger.error("Category catalog load error: %s", e)
+
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=settings.CATEGORY_CATALOG_RELOAD_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
\ No newline at end of file
@@ -1,28 +1,76 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import aliased
 from app.models.comment import Comment
 from app.models.user import UserRole
 from app.models.post import Post
 from app.schemas.comment import CommentCreate
+from app.core.pagination import apply_keyset, next_cursor_for
+from app.services.counter_service import comments_by_post_key, increment_counter, get_counter
+from app.services.redis_cache_service import bump_comments_version
+from app.services.trending_service import record_engagement
 from fastapi import HTTPException, status
+from typing import Any, Dict, Optional
 
-def create_comment(db: Session, comment: CommentCreate, post_id: int, author_id: int) -> Comment:
-    post = db.query(Post).filter(Post.id == post_id).first()
+COMMENT_MAX_DEPTH = 20
+PATH_SEGMENT_WIDTH = 10
+
+def comment_path_segment(comment_id: int) -> str:
+    return f"{comment_id:0{PATH_SEGMENT_WIDTH}d}/"
+
+async def create_comment(db: AsyncSession, comment: CommentCreate, post_id: int, author_id: int) -> Comment:
+    post = (await db.execute(select(Post.id, Post.category_id).where(Post.id == post_id))).first()
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
-    db_comment = Comment(content=comment.content, post_id=post_id, author_id=author_id)
+    parent = None
+    if comment.parent_id is not None:
+        parent = (await db.execute(
+            select(Comment.id, Comment.post_id, Comment.root_id, Comment.depth, Comment.path)
+            .where(Comment.id == comment.parent_id)
+        )).first()
+        if not parent or parent.post_id != post_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Parent comment not found"
+            )
+        if parent.depth + 1 > COMMENT_MAX_DEPTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Replies are nested too deeply"
+            )
+    
+    db_comment = Comment(
+        content=comment.content,
+        post_id=post_id,
+        author_id=author_id,
+        parent_id=parent.id if parent else None,
+        depth=parent.depth + 1 if parent else 0
+    )
     
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.flush()
+    
+    if parent:
+        db_comment.root_id = parent.root_id or parent.id
+        db_comment.path = (parent.path or comment_path_segment(parent.id)) + comment_path_segment(db_comment.id)
+    else:
+        db_comment.root_id = db_comment.id
+        db_comment.path = comment_path_segment(db_comment.id)
+    
+    await increment_counter(db, comments_by_post_key(post_id))
+    await db.commit()
+    await db.refresh(db_comment)
+    
+    await bump_comments_version(post_id)
+    await record_engagement(post_id, post.category_id, "comment")
     return db_comment
 
-def get_comment_by_id(db: Session, comment_id: int) -> Comment:
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+async def get_comment_by_id(db: AsyncSession, comment_id: int) -> Comment:
+    comment = await db.scalar(select(Comment).where(Comment.id == comment_id))
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -30,32 +78,122 @@ def get_comment_by_id(db: Session, comment_id: int) -> Comment:
         )
     return comment
 
-def list_comments_for_post(db: Session, post_id: int, skip: int = 0, limit: int = 10) -> dict:
-    post = db.query(Post).filter(Post.id == post_id).first()
+async def list_comments_for_post(db: AsyncSession, post_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = True) -> dict:
+    post = await db.scalar(select(Post.id).where(Post.id == post_id))
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
-    query = db.query(Comment).filter(
+    query = select(Comment).where(
         Comment.post_id == post_id
-    ).order_by(desc(Comment.created_at))
+    )
+    
+    total = None
+    if include_total:
+        total = await get_counter(db, comments_by_post_key(post_id))
+        if total is None:
+            total = await db.scalar(select(func.count(Comment.id)).where(Comment.post_id == post_id))
+    
+    if cursor:
+        skip = 0
     
-    total = query.count()
-    comments = query.offset(skip).limit(limit).all()
+    comments = list(await db.scalars(
+        apply_keyset(query, Comment.created_at, Comment.id, cursor).offset(skip).limit(limit)
+    ))
     
     return {
         "comments": comments,
-        "total": total
+        "total": total,
+        "next_cursor": next_cursor_for(comments, limit, lambda comment: comment.created_at, lambda comment: comment.id)
     }
 
-def delete_comment(db: Session, comment_id: int, user_id: int, user_role: UserRole) -> bool:
-    comment = get_comment_by_id(db, comment_id)
+async def list_comment_threads(db: AsyncSession, post_id: int, limit: int = 10, replies: int = 3, cursor: Optional[str] = None) -> Dict[str, Any]:
+    post = await db.scalar(select(Post.id).where(Post.id == post_id))
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    
+    roots = apply_keyset(
+        select(Comment.id.label("id"), Comment.created_at.label("created_at")).where(Comment.post_id == post_id, Comment.depth == 0),
+        Comment.created_at,
+        Comment.id,
+        cursor
+    ).limit(limit).subquery()
+    
+    thread_comments = (
+        select(
+            Comment,
+            func.row_number().over(partition_by=Comment.root_id, order_by=Comment.path).label("position"),
+            func.count().over(partition_by=Comment.root_id).label("thread_size")
+        )
+        .join(roots, Comment.root_id == roots.c.id)
+        .subquery()
+    )
+    thread_comment = aliased(Comment, thread_comments)
+    
+    rows = (await db.execute(
+        select(thread_comment, thread_comments.c.thread_size)
+        .where(thread_comments.c.position <= replies + 1)
+        .order_by(thread_comments.c.root_id, thread_comments.c.path)
+    )).all()
+    
+    threads_by_root = {}
+    for comment, thread_size in rows:
+        if comment.id == comment.root_id:
+            threads_by_root[comment.id] = {"comment": comment, "replies": [], "reply_count": thread_size - 1}
+        else:
+            threads_by_root[comment.root_id]["replies"].append(comment)
+    
+    threads = sorted(
+        threads_by_root.values(),
+        key=lambda thread: (thread["comment"].created_at, thread["comment"].id),
+        reverse=True
+    )
+    
+    return {
+        "threads": threads,
+        "next_cursor": next_cursor_for(threads, limit, lambda thread: thread["comment"].created_at, lambda thread: thread["comment"].id)
+    }
+
+async def get_comment_subtree(db: AsyncSession, comment_id: int, limit: int = 200) -> Dict[str, Any]:
+    comment = await get_comment_by_id(db, comment_id)
+    path = comment.path or comment_path_segment(comment.id)
+    
+    comments = list(await db.scalars(
+        select(Comment)
+        .where(Comment.post_id == comment.post_id, Comment.path.like(f"{path}%"))
+        .order_by(Comment.path)
+        .limit(limit + 1)
+    ))
+    
+    return {
+        "comments": comments[:limit] or [comment],
+        "truncated": len(comments) > limit
+    }
+
+async def delete_comment(db: AsyncSession, comment_id: int, user_id: int, user_role: UserRole) -> bool:
+    comment = await get_comment_by_id(db, comment_id)
     
     if user_role == UserRole.ADMIN or comment.author_id == user_id:
-        db.delete(comment)
-        db.commit()
+        path = comment.path or comment_path_segment(comment.id)
+        result = await db.execute(
+            delete(Comment)
+            .where(Comment.post_id == comment.post_id, Comment.path.like(f"{path}%"))
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.rowcount
+        if not comment.path:
+            await db.execute(delete(Comment).where(Comment.id == comment.id).execution_options(synchronize_session=False))
+            deleted += 1
+        
+        await increment_counter(db, comments_by_post_key(comment.post_id), -deleted)
+        await db.commit()
+        
+        await bump_comments_version(comment.post_id)
         return True
     
     raise HTTPException(
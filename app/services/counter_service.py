@@ -0,0 +1,126 @@
+import random
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update, delete, insert
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Iterable, Optional
+from app.config import settings
+from app.models.counter import Counter
+from app.models.category import Category
+from app.models.post import Post
+from app.models.comment import Comment
+from app.models.bookmark import Bookmark
+from app.models.notification import Notification
+from app.models.follow import AuthorFollow, CategoryFollow
+
+POSTS_TOTAL = "posts:total"
+CATEGORIES_TOTAL = "categories:total"
+CATEGORY_CATALOG_SEQUENCE = "categories:catalog:sequence"
+
+def counter_shard_key(name: str, shard: int) -> str:
+    return f"{name}:{shard}"
+
+def posts_by_category_key(category_id: int) -> str:
+    return f"posts:category:{category_id}"
+
+def post_count_sequence_key(category_id: int) -> str:
+    return f"posts:category:{category_id}:sequence"
+
+def posts_by_author_key(author_id: int) -> str:
+    return f"posts:author:{author_id}"
+
+def comments_by_post_key(post_id: int) -> str:
+    return f"comments:post:{post_id}"
+
+def bookmarks_by_user_key(user_id: int) -> str:
+    return f"bookmarks:user:{user_id}"
+
+def unread_notifications_key(user_id: int) -> str:
+    return f"notifications:unread:user:{user_id}"
+
+def followers_by_author_key(author_id: int) -> str:
+    return f"followers:author:{author_id}"
+
+def followers_by_category_key(category_id: int) -> str:
+    return f"followers:category:{category_id}"
+
+async def increment_counter(db: AsyncSession, name: str, delta: int = 1) -> None:
+    if not delta:
+        return
+
+    stmt = (
+        update(Counter)
+        .where(Counter.name == name)
+        .values(value=Counter.value + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+    result = await db.execute(stmt)
+    if result.rowcount:
+        return
+
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(Counter).values(name=name, value=delta))
+    except IntegrityError:
+        await db.execute(stmt)
+
+async def increment_striped_counter(db: AsyncSession, name: str, delta: int = 1) -> None:
+    # Concurrent writers land on different rows instead of queueing on one.
+    await increment_counter(db, counter_shard_key(name, random.randrange(max(settings.COUNTER_SHARDS, 1))), delta)
+
+async def get_counter(db: AsyncSession, name: str) -> Optional[int]:
+    return await db.scalar(select(Counter.value).where(Counter.name == name))
+
+async def get_striped_counter(db: AsyncSession, name: str) -> Optional[int]:
+    # Sums every shard row, including ones left over from a larger COUNTER_SHARDS.
+    return await db.scalar(select(func.sum(Counter.value)).where(Counter.name.like(f"{name}:%")))
+
+async def get_counters(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    names = list(names)
+    if not names:
+        return {}
+
+    result = await db.execute(select(Counter.name, Counter.value).where(Counter.name.in_(names)))
+    return dict(result.all())
+
+async def delete_counters(db: AsyncSession, names: Iterable[str]) -> None:
+    names = list(names)
+    if names:
+        await db.execute(
+            delete(Counter)
+            .where(Counter.name.in_(names))
+            .execution_options(synchronize_session=False)
+        )
+
+async def rebuild_counters(db: AsyncSession) -> int:
+    counters = {
+        counter_shard_key(POSTS_TOTAL, 0): await db.scalar(select(func.count(Post.id))),
+        CATEGORIES_TOTAL: await db.scalar(select(func.count(Category.id)))
+    }
+
+    grouped_counts = [
+        (posts_by_category_key, select(Post.category_id, func.count(Post.id)).where(Post.category_id.isnot(None)).group_by(Post.category_id)),
+        (posts_by_author_key, select(Post.author_id, func.count(Post.id)).group_by(Post.author_id)),
+        (comments_by_post_key, select(Comment.post_id, func.count(Comment.id)).group_by(Comment.post_id)),
+        (bookmarks_by_user_key, select(Bookmark.user_id, func.count(Bookmark.id)).group_by(Bookmark.user_id)),
+        (unread_notifications_key, select(Notification.user_id, func.count(Notification.id)).where(Notification.is_read.is_(False)).group_by(Notification.user_id)),
+        (followers_by_author_key, select(AuthorFollow.author_id, func.count()).group_by(AuthorFollow.author_id)),
+        (followers_by_category_key, select(CategoryFollow.category_id, func.count()).group_by(CategoryFollow.category_id))
+    ]
+
+    for key_for, stmt in grouped_counts:
+        for owner_id, count in await db.execute(stmt):
+            counters[key_for(owner_id)] = count
+
+    # Catalog sequences are not derived from other tables and must keep growing.
+    await db.execute(
+        delete(Counter)
+        .where(Counter.name != CATEGORY_CATALOG_SEQUENCE, Counter.name.notlike(post_count_sequence_key("%")))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(insert(Counter), [
+        {"name": name, "value": value} for name, value in counters.items()
+    ])
+    await db.commit()
+
+    return len(counters)
@@ -0,0 +1,121 @@
+import logging
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.redis_client import get_async_redis
+from app.models.follow import AuthorFollow, CategoryFollow
+from app.models.post import Post
+from app.services.counter_service import followers_by_author_key, followers_by_category_key, get_counters
+from app.services.post_service import get_posts_by_ids
+from app.services.timeline_service import (
+    author_timeline_key,
+    category_timeline_key,
+    FEED_SENTINEL,
+    is_heavy,
+    push_to_timelines,
+    remove_from_feed,
+    replace_feed,
+    user_feed_key
+)
+
+logger = logging.getLogger(__name__)
+
+def decode_feed_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def feed_ids_from_db(db: AsyncSession, user_id: int, before_id: Optional[int], limit: int) -> List[int]:
+    query = select(Post.id).where(
+        or_(
+            Post.author_id.in_(select(AuthorFollow.author_id).where(AuthorFollow.follower_id == user_id)),
+            Post.category_id.in_(select(CategoryFollow.category_id).where(CategoryFollow.follower_id == user_id))
+        )
+    )
+    if before_id is not None:
+        query = query.where(Post.id < before_id)
+
+    return list(await db.scalars(query.order_by(Post.id.desc()).limit(limit)))
+
+async def rebuild_feed(db: AsyncSession, user_id: int) -> None:
+    post_ids = await feed_ids_from_db(db, user_id, None, settings.FEED_MAX_LENGTH)
+    await replace_feed(user_id, post_ids)
+
+async def rebuild_timeline(db: AsyncSession, key: str, condition) -> None:
+    post_ids = list(await db.scalars(
+        select(Post.id).where(condition).order_by(Post.id.desc()).limit(settings.FEED_MAX_LENGTH)
+    ))
+    await push_to_timelines([key], post_ids)
+
+async def heavy_sources(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    author_ids = list(await db.scalars(select(AuthorFollow.author_id).where(AuthorFollow.follower_id == user_id)))
+    category_ids = list(await db.scalars(select(CategoryFollow.category_id).where(CategoryFollow.follower_id == user_id)))
+
+    follower_counts = await get_counters(
+        db,
+        [followers_by_author_key(author_id) for author_id in author_ids] +
+        [followers_by_category_key(category_id) for category_id in category_ids]
+    )
+
+    sources = {}
+    for author_id in author_ids:
+        if is_heavy(follower_counts.get(followers_by_author_key(author_id))):
+            sources[author_timeline_key(author_id)] = Post.author_id == author_id
+    for category_id in category_ids:
+        if is_heavy(follower_counts.get(followers_by_category_key(category_id))):
+            sources[category_timeline_key(category_id)] = Post.category_id == category_id
+
+    return sources
+
+async def read_feed_ids(db: AsyncSession, user_id: int, before_id: Optional[int], limit: int) -> List[int]:
+    redis_client = get_async_redis()
+    feed_key = user_feed_key(user_id)
+    max_score = f"({before_id}" if before_id is not None else "+inf"
+
+    if await redis_client.zscore(feed_key, FEED_SENTINEL) is None:
+        await rebuild_feed(db, user_id)
+
+    sources = await heavy_sources(db, user_id)
+    if sources:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in sources:
+            pipe.exists(key)
+        for key, exists in zip(list(sources), await pipe.execute()):
+            if not exists:
+                await rebuild_timeline(db, key, sources[key])
+
+    pipe = redis_client.pipeline(transaction=False)
+    for key in [feed_key, *sources]:
+        pipe.zrevrangebyscore(key, max_score, f"({FEED_SENTINEL}", start=0, num=limit)
+    pipe.expire(feed_key, settings.FEED_TTL)
+
+    post_ids = {int(post_id) for members in (await pipe.execute())[:-1] for post_id in members}
+    return sorted(post_ids, reverse=True)[:limit]
+
+async def get_feed(db: AsyncSession, user_id: int, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    limit = min(limit, settings.FEED_PAGE_MAX_SIZE)
+    before_id = decode_feed_cursor(cursor)
+
+    try:
+        post_ids = await read_feed_ids(db, user_id, before_id, limit)
+    except RedisError as e:
+        logger.warning("Redis error reading feed of user %s, falling back to database: %s", user_id, e)
+        post_ids = await feed_ids_from_db(db, user_id, before_id, limit)
+
+    result = await get_posts_by_ids(db, post_ids)
+    if result["missing"]:
+        await remove_from_feed(user_id, result["missing"])
+
+    return {
+        "posts": result["posts"],
+        "next_cursor": str(post_ids[-1]) if len(post_ids) == limit else None
+    }
@@ -0,0 +1,109 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, delete, not_, or_, select
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from typing import Dict, List
+from app.config import settings
+from app.models.follow import AuthorFollow, CategoryFollow
+from app.models.post import Post
+from app.models.user import User
+from app.services.category_service import ensure_category_exists
+from app.services.counter_service import followers_by_author_key, followers_by_category_key, increment_counter, get_counter
+from app.services.timeline_service import add_to_feed, remove_from_feed
+
+async def list_follows(db: AsyncSession, user_id: int) -> Dict[str, List[int]]:
+    return {
+        "authors": list(await db.scalars(select(AuthorFollow.author_id).where(AuthorFollow.follower_id == user_id))),
+        "categories": list(await db.scalars(select(CategoryFollow.category_id).where(CategoryFollow.follower_id == user_id)))
+    }
+
+async def recent_post_ids(db: AsyncSession, condition, limit: int) -> List[int]:
+    return list(await db.scalars(select(Post.id).where(condition).order_by(Post.id.desc()).limit(limit)))
+
+async def create_follow(db: AsyncSession, follow, counter_name: str) -> int:
+    try:
+        db.add(follow)
+        await increment_counter(db, counter_name)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already following"
+        )
+
+    return await get_counter(db, counter_name) or 0
+
+async def remove_follow(db: AsyncSession, stmt, counter_name: str) -> int:
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    if not result.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not following"
+        )
+
+    await increment_counter(db, counter_name, -1)
+    await db.commit()
+
+    return await get_counter(db, counter_name) or 0
+
+async def follow_author(db: AsyncSession, follower_id: int, author_id: int) -> Dict[str, int]:
+    if follower_id == author_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot follow yourself"
+        )
+
+    if not await db.scalar(select(User.id).where(User.id == author_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    followers = await create_follow(db, AuthorFollow(follower_id=follower_id, author_id=author_id), followers_by_author_key(author_id))
+    await add_to_feed(follower_id, await recent_post_ids(db, Post.author_id == author_id, settings.FEED_BACKFILL_SIZE))
+
+    return {"followers": followers}
+
+async def unfollow_author(db: AsyncSession, follower_id: int, author_id: int) -> Dict[str, int]:
+    followers = await remove_follow(
+        db,
+        delete(AuthorFollow).where(AuthorFollow.follower_id == follower_id, AuthorFollow.author_id == author_id),
+        followers_by_author_key(author_id)
+    )
+
+    still_followed_categories = select(CategoryFollow.category_id).where(CategoryFollow.follower_id == follower_id)
+    await remove_from_feed(follower_id, await recent_post_ids(
+        db,
+        and_(
+            Post.author_id == author_id,
+            or_(Post.category_id.is_(None), not_(Post.category_id.in_(still_followed_categories)))
+        ),
+        settings.FEED_MAX_LENGTH
+    ))
+
+    return {"followers": followers}
+
+async def follow_category(db: AsyncSession, follower_id: int, category_id: int) -> Dict[str, int]:
+    await ensure_category_exists(db, category_id)
+
+    followers = await create_follow(db, CategoryFollow(follower_id=follower_id, category_id=category_id), followers_by_category_key(category_id))
+    await add_to_feed(follower_id, await recent_post_ids(db, Post.category_id == category_id, settings.FEED_BACKFILL_SIZE))
+
+    return {"followers": followers}
+
+async def unfollow_category(db: AsyncSession, follower_id: int, category_id: int) -> Dict[str, int]:
+    followers = await remove_follow(
+        db,
+        delete(CategoryFollow).where(CategoryFollow.follower_id == follower_id, CategoryFollow.category_id == category_id),
+        followers_by_category_key(category_id)
+    )
+
+    still_followed_authors = select(AuthorFollow.author_id).where(AuthorFollow.follower_id == follower_id)
+    await remove_from_feed(follower_id, await recent_post_ids(
+        db,
+        and_(Post.category_id == category_id, not_(Post.author_id.in_(still_followed_authors))),
+        settings.FEED_MAX_LENGTH
+    ))
+
+    return {"followers": followers}
@@ -1,18 +1,70 @@
-from sqlalchemy.orm import Session
+import json
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import List, Optional
+from app.config import settings
+from app.core.pagination import apply_keyset, next_cursor_for
 from app.models.notification import Notification
-from app.core.kafka_producer import KafkaNotificationProducer
+from app.models.outbox import OutboxEvent
+from app.services.counter_service import unread_notifications_key, increment_counter, get_counter
 
-def create_database_notification(db: Session, user_id: int, message: str, notification_type: str, related_id: int = None):
+async def create_database_notification(db: AsyncSession, user_id: int, message: str, notification_type: str, related_id: int = None):
     notification = Notification(user_id=user_id, content=message, notification_type=notification_type, related_id=related_id)
     db.add(notification)
-    db.commit()
-    db.refresh(notification)
+    await increment_counter(db, unread_notifications_key(user_id))
+    await db.flush()
+    
+    db.add(OutboxEvent(
+        topic=settings.KAFKA_NOTIFICATION_TOPIC,
+        message_key=str(user_id),
+        payload=json.dumps({
+            'notification_id': notification.id,
+            'user_id': user_id,
+            'message': message,
+            'type': notification_type,
+            'related_id': related_id
+        })
+    ))
     return notification
 
-def send_like_notification(db: Session, post_author_id: int, liker_username: str, post_id: int):
-    kafka_producer = KafkaNotificationProducer()
-    
+async def send_like_notification(db: AsyncSession, post_author_id: int, liker_username: str, post_id: int):
     notification_message = f"{liker_username} liked your post"
-    kafka_producer.send_notification(user_id=post_author_id, message=notification_message, notification_type='post_like', related_id=post_id)
     
-    create_database_notification(db, user_id=post_author_id, message=notification_message, notification_type='post_like', related_id=post_id)
\ No newline at end of file
+    return await create_database_notification(db, user_id=post_author_id, message=notification_message, notification_type='post_like', related_id=post_id)
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    return await get_counter(db, unread_notifications_key(user_id)) or 0
+
+async def list_notifications(db: AsyncSession, user_id: int, limit: int = 20, cursor: Optional[str] = None, unread_only: bool = False) -> dict:
+    query = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        query = query.where(Notification.is_read.is_(False))
+    
+    notifications = list(await db.scalars(
+        apply_keyset(query, Notification.created_at, Notification.id, cursor).limit(limit)
+    ))
+    
+    return {
+        "notifications": notifications,
+        "unread": await get_unread_count(db, user_id),
+        "next_cursor": next_cursor_for(notifications, limit, lambda notification: notification.created_at, lambda notification: notification.id)
+    }
+
+async def mark_notifications_read(db: AsyncSession, user_id: int, notification_ids: Optional[List[int]] = None) -> dict:
+    stmt = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if notification_ids is not None:
+        stmt = stmt.where(Notification.id.in_(notification_ids))
+    
+    result = await db.execute(stmt)
+    await increment_counter(db, unread_notifications_key(user_id), -result.rowcount)
+    await db.commit()
+    
+    return {
+        "updated": result.rowcount,
+        "unread": await get_unread_count(db, user_id)
+    }
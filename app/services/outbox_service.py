@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from collections import defaultdict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+from typing import Dict, List, Optional
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.kafka_producer import KafkaNotificationProducer
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+async def claim_outbox_events(db: AsyncSession, batch_size: int) -> List[OutboxEvent]:
+    pending = OutboxEvent.dead_lettered_at.is_(None)
+    key_heads = select(func.min(OutboxEvent.id)).where(pending).group_by(OutboxEvent.message_key)
+    
+    # Only the oldest pending event of a key is locked, so a relay that skips
+    # a locked head skips the whole key and two relays never split one key.
+    keys = list(await db.scalars(
+        select(OutboxEvent.message_key)
+        .where(OutboxEvent.id.in_(key_heads))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ))
+    if not keys:
+        return []
+    
+    return list(await db.scalars(
+        select(OutboxEvent)
+        .where(pending, OutboxEvent.message_key.in_(keys))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update()
+    ))
+
+async def relay_outbox_batch(db: AsyncSession, producer: KafkaNotificationProducer, batch_size: Optional[int] = None) -> int:
+    events = await claim_outbox_events(db, batch_size or settings.OUTBOX_BATCH_SIZE)
+    
+    if not events:
+        await db.commit()
+        return 0
+    
+    events_by_key: Dict[str, List[OutboxEvent]] = defaultdict(list)
+    for event in events:
+        events_by_key[event.message_key].append(event)
+    
+    # Each wave sends the next event of every key that has not failed yet, so
+    # an event is only sent once everything before it for its key is delivered.
+    delivered_ids = []
+    failed_events = []
+    wave_index = 0
+    wave = [key_events[0] for key_events in events_by_key.values()]
+    while wave:
+        results = await asyncio.to_thread(
+            producer.send_batch,
+            [(event.topic, event.message_key, event.payload.encode('utf-8')) for event in wave],
+            settings.OUTBOX_DELIVERY_TIMEOUT
+        )
+        
+        wave_index += 1
+        next_wave = []
+        for event, delivered in zip(wave, results):
+            if not delivered:
+                failed_events.append(event)
+                continue
+            
+            delivered_ids.append(event.id)
+            key_events = events_by_key[event.message_key]
+            if wave_index < len(key_events):
+                next_wave.append(key_events[wave_index])
+        wave = next_wave
+    
+    if delivered_ids:
+        await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(delivered_ids)).execution_options(synchronize_session=False))
+    
+    dead_ids = [event.id for event in failed_events if event.attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS]
+    if failed_events:
+        await db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([event.id for event in failed_events]))
+            .values(attempts=OutboxEvent.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+    if dead_ids:
+        await db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(dead_ids))
+            .values(dead_lettered_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    
+    if failed_events:
+        logger.warning(
+            "Outbox relay: %s of %s keys stopped on an undelivered event, will retry",
+            len(failed_events), len(events_by_key)
+        )
+    if dead_ids:
+        logger.error("Outbox relay: events %s reached %s attempts and were dead-lettered", dead_ids, settings.OUTBOX_MAX_ATTEMPTS)
+    
+    return len(delivered_ids)
+
+class OutboxRelay:
+    def __init__(self, producer: Optional[KafkaNotificationProducer] = None):
+        self.producer = producer
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self.task is None:
+            self.producer = self.producer or KafkaNotificationProducer()
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as db:
+                    relayed = await relay_outbox_batch(db, self.producer)
+            except Exception as e:
+                logger.error("Outbox relay error: %s", e)
+                relayed = 0
+            
+            if relayed < settings.OUTBOX_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=settings.OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
@@ -1,20 +1,45 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
-from app.models.post import Post
-from app.models.category import Category
-from app.models.user import User, Base
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select, update, delete, insert
+from sqlalchemy.exc import IntegrityError
+from app.models.post import Post, post_likes
+from app.models.user import User
 from app.models.user import UserRole
+from app.models.bookmark import Bookmark
+from app.models.comment import Comment
 from app.schemas.post import PostCreate, PostFilter
-from app.services.category_service import get_category_by_id
+from collections import Counter as TallyCounter
+from app.services.category_service import adjust_category_post_counts, ensure_categories_exist, ensure_category_exists, count_category_posts
+from app.services.notification_service import send_like_notification
+from app.services.timeline_service import feed_fanout, move_between_category_timelines, remove_from_timelines
+from app.services.trending_service import get_trending_post_ids, move_trending_category, record_engagement, remove_from_trending
+from app.services.search_service import discard_from_index, get_search_index, index_post, index_posts, remove_posts_from_index
+from app.core.pagination import apply_keyset, next_cursor_for
+from app.services.counter_service import (
+    POSTS_TOTAL,
+    posts_by_category_key,
+    posts_by_author_key,
+    comments_by_post_key,
+    bookmarks_by_user_key,
+    increment_counter,
+    increment_striped_counter,
+    get_counter,
+    get_striped_counter,
+    delete_counters
+)
 from fastapi import HTTPException, status
-from typing import Optional, Dict, Any
-from app.services.redis_cache_service import (cache_post, cache_posts_list, get_cached_post, get_cached_posts_list, invalidate_post_cache, invalidate_posts_list_cache)
+from typing import Optional, Dict, Any, List
+import asyncio
+from app.services.redis_cache_service import (bump_comments_version, cache_post, cache_posts, get_cached_post, get_cached_posts, get_cached_posts_list, invalidate_post_cache, invalidate_post_caches, invalidate_posts_list_cache)
 
-def create_post(db: Session, post: PostCreate, author_id: int) -> Post:
+POSTS_BATCH_MAX_IDS = 100
+RECOMPUTE_BATCH_SIZE = 1000
+
+async def create_post(db: AsyncSession, post: PostCreate, author_id: int) -> Post:
     category_id = None if post.category_id == 0 else post.category_id
 
     if category_id is not None:
-        get_category_by_id(db, category_id)
+        await ensure_category_exists(db, category_id)
     
     db_post = Post(
         title=post.title,
@@ -24,161 +49,387 @@ def create_post(db: Session, post: PostCreate, author_id: int) -> Post:
     )
     
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
+    await increment_striped_counter(db, POSTS_TOTAL)
+    await increment_counter(db, posts_by_author_key(author_id))
+    count_sequences = await count_category_posts(db, {db_post.category_id: 1})
+    await db.commit()
+    db_post = await get_post_model(db, db_post.id)
     
-    invalidate_posts_list_cache()
+    await invalidate_posts_list_cache()
+    await adjust_category_post_counts({db_post.category_id: 1}, count_sequences)
     
-    cache_post({
-        'id': db_post.id,
-        'title': db_post.title,
-        'content': db_post.content,
-        'author_id': db_post.author_id,
-        'category_id': db_post.category_id,
-        'created_at': db_post.created_at.isoformat() if db_post.created_at else None,
-        'category': db_post.category.name if db_post.category else None
-    })
+    await cache_post(serialize_post(db_post))
+    await index_post(db_post)
+    await feed_fanout.enqueue(author_id, [(db_post.id, db_post.category_id)])
     
     return db_post
 
-def get_post_by_id(db: Session, post_id: int) -> Post:
-    cached_post = get_cached_post(post_id)
-    if cached_post:
-        return db.query(Post).options(joinedload(Post.category)).filter(Post.id == post_id).first()
+async def create_posts_bulk(db: AsyncSession, posts: List[PostCreate], author_id: int) -> Dict[str, int]:
+    category_ids = {post.category_id for post in posts if post.category_id is not None}
     
-    post = db.query(Post).options(joinedload(Post.category)).filter(Post.id == post_id).first()
+    await ensure_categories_exist(db, category_ids)
     
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    rows = [
+        {
+            'title': post.title,
+            'content': post.content,
+            'author_id': author_id,
+            'category_id': post.category_id
+        } for post in posts
+    ]
+    if db.bind.dialect.insert_executemany_returning:
+        created_posts = list(await db.scalars(insert(Post).returning(Post, sort_by_parameter_order=True), rows))
+    else:
+        # Without RETURNING the ORM flush reads each new id from its own INSERT.
+        created_posts = [Post(**row) for row in rows]
+        db.add_all(created_posts)
+        await db.flush()
+    
+    await increment_striped_counter(db, POSTS_TOTAL, len(posts))
+    await increment_counter(db, posts_by_author_key(author_id), len(posts))
+    category_counts = TallyCounter(post.category_id for post in posts if post.category_id is not None)
+    count_sequences = await count_category_posts(db, category_counts)
+    await db.commit()
     
-    cache_post({
+    await invalidate_posts_list_cache()
+    await adjust_category_post_counts(category_counts, count_sequences)
+    
+    await index_posts(created_posts)
+    await feed_fanout.enqueue(author_id, [(post.id, post.category_id) for post in created_posts])
+    
+    return {"created": len(posts)}
+
+def serialize_post(post: Post) -> Dict[str, Any]:
+    return {
         'id': post.id,
         'title': post.title,
         'content': post.content,
         'author_id': post.author_id,
         'category_id': post.category_id,
+        'category': {
+            'id': post.category.id,
+            'name': post.category.name,
+            'description': post.category.description
+        } if post.category else None,
         'created_at': post.created_at.isoformat() if post.created_at else None,
-        'category': post.category.name if post.category else None
-    })
+        'updated_at': post.updated_at.isoformat() if post.updated_at else None,
+        'likes_count': post.likes_count
+    }
+
+async def get_post_model(db: AsyncSession, post_id: int) -> Post:
+    post = await db.scalar(
+        select(Post)
+        .options(joinedload(Post.category))
+        .where(Post.id == post_id)
+        .execution_options(populate_existing=True)
+    )
+    
+    if not post:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     
     return post
 
-def list_posts(db: Session, skip: int = 0, limit: int = 10, filters: Optional[PostFilter] = None) -> Dict[str, Any]:
-    filter_dict = {
-        'category_id': filters.category_id if filters else None,
-        'author_id': filters.author_id if filters else None,
-        'start_date': str(filters.start_date) if filters and filters.start_date else None,
-        'end_date': str(filters.end_date) if filters and filters.end_date else None,
-        'skip': skip,
-        'limit': limit
+async def load_post_data(db: AsyncSession, post_id: int) -> Dict[str, Any]:
+    return serialize_post(await get_post_model(db, post_id))
+
+async def get_post_by_id(db: AsyncSession, post_id: int) -> Dict[str, Any]:
+    cached_post = await get_cached_post(post_id, lambda: load_post_data(db, post_id))
+    return cached_post.value
+
+async def get_posts_by_ids(db: AsyncSession, post_ids: List[int]) -> Dict[str, Any]:
+    post_ids = list(dict.fromkeys(post_ids))
+    if len(post_ids) > POSTS_BATCH_MAX_IDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {POSTS_BATCH_MAX_IDS} ids per request")
+    
+    cached_posts = await get_cached_posts(post_ids)
+    posts_by_id = cached_posts.posts
+    missing_ids = [post_id for post_id in post_ids if post_id not in posts_by_id]
+    
+    if missing_ids:
+        fetched_posts = [
+            serialize_post(post)
+            for post in await db.scalars(
+                select(Post)
+                .options(joinedload(Post.category))
+                .where(Post.id.in_(missing_ids))
+            )
+        ]
+        await cache_posts(fetched_posts, cached_posts.versions)
+        posts_by_id.update({post['id']: post for post in fetched_posts})
+    
+    return {
+        "posts": [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id],
+        "missing": [post_id for post_id in post_ids if post_id not in posts_by_id]
     }
+
+async def search_posts(db: AsyncSession, query: str, limit: int = 10, skip: int = 0) -> Dict[str, Any]:
+    hits, total = await asyncio.to_thread(get_search_index().search, query, limit, skip)
     
-    cached_posts = get_cached_posts_list(filter_dict)
-    if cached_posts:
-        post_ids = [post['id'] for post in cached_posts['posts']]
-        posts = (
-            db.query(Post)
-            .options(joinedload(Post.category))
-            .filter(Post.id.in_(post_ids))
-            .order_by(Post.id) 
-            .all()
-        )
-        
-        return {
-            "posts": posts,
-            "total": cached_posts['total']
-        }
+    result = await get_posts_by_ids(db, [post_id for post_id, _ in hits])
+    if result["missing"]:
+        await discard_from_index(result["missing"])
+    
+    return {
+        "posts": result["posts"],
+        "total": total
+    }
+
+async def get_trending_posts(db: AsyncSession, category_id: Optional[int] = None, limit: int = 10) -> Dict[str, Any]:
+    post_ids = await get_trending_post_ids(category_id, min(limit, POSTS_BATCH_MAX_IDS))
+    
+    result = await get_posts_by_ids(db, post_ids)
+    for post_id in result["missing"]:
+        await remove_from_trending(post_id, category_id)
+    
+    return {
+        "posts": result["posts"]
+    }
+
+def posts_counter_for_filters(filters: Optional[PostFilter]) -> Optional[str]:
+    if not filters:
+        return POSTS_TOTAL
     
-    query = db.query(Post).options(joinedload(Post.category)).order_by(desc(Post.created_at))
+    if filters.start_date or filters.end_date:
+        return None
+    
+    if filters.category_id is not None and filters.author_id is not None:
+        return None
+    
+    if filters.category_id is not None:
+        return posts_by_category_key(filters.category_id)
+    
+    if filters.author_id is not None:
+        return posts_by_author_key(filters.author_id)
+    
+    return POSTS_TOTAL
+
+async def count_posts(db: AsyncSession, query, filters: Optional[PostFilter]) -> int:
+    counter_name = posts_counter_for_filters(filters)
+    
+    if counter_name is not None:
+        if counter_name == POSTS_TOTAL:
+            total = await get_striped_counter(db, counter_name)
+        else:
+            total = await get_counter(db, counter_name)
+        if total is not None:
+            return total
+    
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+async def fetch_posts_page(db: AsyncSession, skip: int, limit: int, filters: Optional[PostFilter], cursor: Optional[str], include_total: bool) -> Dict[str, Any]:
+    query = select(Post)
     
     if filters:
         if filters.category_id is not None:
-            query = query.filter(Post.category_id == filters.category_id)
+            query = query.where(Post.category_id == filters.category_id)
         
         if filters.author_id is not None:
-            query = query.filter(Post.author_id == filters.author_id)
+            query = query.where(Post.author_id == filters.author_id)
         
         if filters.start_date:
-            query = query.filter(Post.created_at >= filters.start_date)
+            query = query.where(Post.created_at >= filters.start_date)
         
         if filters.end_date:
-            query = query.filter(Post.created_at <= filters.end_date)
-    
-    total = query.count()
-    posts = query.offset(skip).limit(limit).all()
-    
-    cached_posts_data = {
-        'posts': [
-            {
-                'id': post.id,
-                'title': post.title,
-                'content': post.content,
-                'author_id': post.author_id,
-                'category_id': post.category_id,
-                'created_at': post.created_at.isoformat() if post.created_at else None,
-                'category': post.category.name if post.category else None
-            } for post in posts
-        ],
-        'total': total
+            query = query.where(Post.created_at <= filters.end_date)
+    
+    total = await count_posts(db, query, filters) if include_total else None
+    posts = list(await db.scalars(
+        apply_keyset(query.options(joinedload(Post.category)), Post.created_at, Post.id, cursor)
+        .offset(skip)
+        .limit(limit)
+    ))
+    
+    return {
+        'posts': [serialize_post(post) for post in posts],
+        'total': total,
+        'next_cursor': next_cursor_for(posts, limit, lambda post: post.created_at, lambda post: post.id)
+    }
+
+async def list_posts(db: AsyncSession, skip: int = 0, limit: int = 10, filters: Optional[PostFilter] = None, cursor: Optional[str] = None, include_total: bool = True) -> Dict[str, Any]:
+    if cursor:
+        skip = 0
+    
+    filter_dict = {
+        'category_id': filters.category_id if filters else None,
+        'author_id': filters.author_id if filters else None,
+        'start_date': str(filters.start_date) if filters and filters.start_date else None,
+        'end_date': str(filters.end_date) if filters and filters.end_date else None,
+        'skip': skip,
+        'limit': limit,
+        'cursor': cursor,
+        'include_total': include_total
     }
     
-    cache_posts_list(cached_posts_data, filter_dict)
+    cached_posts = await get_cached_posts_list(
+        filter_dict,
+        lambda: fetch_posts_page(db, skip, limit, filters, cursor, include_total)
+    )
     
     return {
-        "posts": posts,
-        "total": total
+        "posts": cached_posts.value['posts'],
+        "total": cached_posts.value['total'],
+        "next_cursor": cached_posts.value.get('next_cursor'),
+        "stale": cached_posts.stale
     }
 
-def update_post(db: Session, post_id: int, post_update: PostCreate, user_id: int, user_role: UserRole) -> Post:
-    db_post = get_post_by_id(db, post_id)
+async def update_post(db: AsyncSession, post_id: int, post_update: PostCreate, user_id: int, user_role: UserRole) -> Post:
+    db_post = await get_post_model(db, post_id)
     
     if user_role != UserRole.ADMIN and db_post.author_id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this post")
     
     if post_update.category_id is not None:
-        get_category_by_id(db, post_update.category_id)
+        await ensure_category_exists(db, post_update.category_id)
+    
+    previous_category_id = db_post.category_id
+    category_deltas = {}
+    count_sequences = {}
+    if post_update.category_id != db_post.category_id:
+        category_deltas = {db_post.category_id: -1, post_update.category_id: 1}
+        count_sequences = await count_category_posts(db, category_deltas)
     
     db_post.title = post_update.title
     db_post.content = post_update.content
     db_post.category_id = post_update.category_id
     
-    db.commit()
-    db.refresh(db_post)
+    await db.commit()
+    db_post = await get_post_model(db, post_id)
     
-    invalidate_post_cache(post_id)
-    invalidate_posts_list_cache()
+    await invalidate_post_cache(post_id)
+    await invalidate_posts_list_cache()
+    await index_post(db_post)
+    if previous_category_id != db_post.category_id:
+        await adjust_category_post_counts(category_deltas, count_sequences)
+        await move_between_category_timelines(post_id, previous_category_id, db_post.category_id)
+        await move_trending_category(post_id, previous_category_id, db_post.category_id)
     
     return db_post
 
-def delete_post(db: Session, post_id: int, user_id: int, user_role: UserRole) -> bool:
-    post = get_post_by_id(db, post_id)
+async def delete_post(db: AsyncSession, post_id: int, user_id: int, user_role: UserRole) -> bool:
+    post = await get_post_model(db, post_id)
     
     if user_role == UserRole.ADMIN or post.author_id == user_id:
-        db.delete(post)
-        db.commit()
+        bookmark_user_ids = list(await db.scalars(
+            select(Bookmark.user_id).where(Bookmark.post_id == post_id)
+        ))
+        
+        await increment_striped_counter(db, POSTS_TOTAL, -1)
+        await increment_counter(db, posts_by_author_key(post.author_id), -1)
+        count_sequences = await count_category_posts(db, {post.category_id: -1})
+        for bookmark_user_id in bookmark_user_ids:
+            await increment_counter(db, bookmarks_by_user_key(bookmark_user_id), -1)
+        await delete_counters(db, [comments_by_post_key(post_id)])
+        
+        await db.execute(post_likes.delete().where(post_likes.c.post_id == post_id))
+        await db.execute(delete(Comment).where(Comment.post_id == post_id).execution_options(synchronize_session=False))
+        await db.execute(delete(Bookmark).where(Bookmark.post_id == post_id).execution_options(synchronize_session=False))
+        await db.execute(delete(Post).where(Post.id == post_id).execution_options(synchronize_session=False))
+        await db.commit()
         
-        invalidate_post_cache(post_id)
-        invalidate_posts_list_cache()
+        await invalidate_post_cache(post_id)
+        await invalidate_posts_list_cache()
+        await bump_comments_version(post_id)
+        await adjust_category_post_counts({post.category_id: -1}, count_sequences)
+        await remove_posts_from_index([post_id])
+        await remove_from_timelines(post_id, post.author_id, post.category_id)
+        await remove_from_trending(post_id, post.category_id)
         
         return True
     
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this post")
 
-def like_post(db: Session, post_id: int, user_id: int, username: str) -> Post:
-    post = get_post_by_id(db, post_id)
+async def like_post(db: AsyncSession, post_id: int, user_id: int, username: str) -> Post:
+    post = await get_post_model(db, post_id)
     
-    if any(liker.id == user_id for liker in post.likers):
-        post.likers = [liker for liker in post.likers if liker.id != user_id]
-    else:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        post.likers.append(user)
+    existing_like = (await db.execute(
+        select(post_likes.c.user_id).where(
+            post_likes.c.user_id == user_id,
+            post_likes.c.post_id == post_id
+        )
+    )).first()
+    
+    if not existing_like and not await db.scalar(select(User.id).where(User.id == user_id)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    likes_delta = 0
+    try:
+        if existing_like:
+            result = await db.execute(
+                post_likes.delete().where(
+                    post_likes.c.user_id == user_id,
+                    post_likes.c.post_id == post_id
+                )
+            )
+            likes_delta = -result.rowcount
+        else:
+            await db.execute(post_likes.insert().values(user_id=user_id, post_id=post_id))
+            likes_delta = 1
+            
+            if post.author_id != user_id:
+                await send_like_notification(db, post_author_id=post.author_id, liker_username=username, post_id=post_id)
+        
+        if likes_delta:
+            await db.execute(
+                update(Post)
+                .where(Post.id == post_id)
+                .values(likes_count=Post.likes_count + likes_delta, updated_at=Post.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        likes_delta = 0
     
-    db.commit()
-    db.refresh(post)
+    post = await get_post_model(db, post_id)
+    
+    if likes_delta:
+        await record_engagement(post_id, post.category_id, "like" if likes_delta > 0 else "unlike")
+    
+    await invalidate_post_cache(post_id)
+    await invalidate_posts_list_cache()
+    
+    return post
+
+async def recompute_likes_counts(
+    db: AsyncSession,
+    first_post_id: Optional[int] = None,
+    last_post_id: Optional[int] = None,
+    batch_size: int = RECOMPUTE_BATCH_SIZE
+) -> int:
+    if first_post_id is None or last_post_id is None:
+        min_id, max_id = (await db.execute(select(func.min(Post.id), func.max(Post.id)))).one()
+        first_post_id = min_id if first_post_id is None else first_post_id
+        last_post_id = max_id if last_post_id is None else last_post_id
+    if first_post_id is None or last_post_id is None:
+        return 0
+    
+    likes_subquery = (
+        select(func.count())
+        .select_from(post_likes)
+        .where(post_likes.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    
+    corrected = 0
+    for range_start in range(first_post_id, last_post_id + 1, batch_size):
+        range_end = min(last_post_id, range_start + batch_size - 1)
+        drifted_ids = list(await db.scalars(
+            select(Post.id).where(Post.id.between(range_start, range_end), Post.likes_count != likes_subquery)
+        ))
+        if not drifted_ids:
+            continue
+        
+        await db.execute(
+            update(Post)
+            .where(Post.id.in_(drifted_ids))
+            .values(likes_count=likes_subquery, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        await invalidate_post_caches(drifted_ids)
+        corrected += len(drifted_ids)
     
-    invalidate_post_cache(post_id)
-    invalidate_posts_list_cache()
+    if corrected:
+        await invalidate_posts_list_cache()
     
-    return post
\ No newline at end of file
+    return corrected
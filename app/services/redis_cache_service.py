@@ -1,45 +1,319 @@
-import json
-import redis
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+import orjson
+from redis.exceptions import RedisError
+from typing import Optional, Dict, Any, List, Awaitable, Callable, Iterable, NamedTuple, Sequence, Tuple
+from app.config import settings
+from app.core.metrics import record_cache, record_cache_invalidation, set_cache_entry_lifetime
+from app.core.redis_client import get_async_redis, setex_many_json
 
-redis_client = redis.Redis(host='redis', port=6379, db=0)
+logger = logging.getLogger(__name__)
+
+POST_CACHE_TTL = 3600
+POSTS_LIST_CACHE_TTL = 300
+RESPONSE_CACHE_TTL = 300
+POSTS_LIST_VERSION_KEY = "posts:list:version"
+CATEGORIES_VERSION_KEY = "categories:version"
+CATEGORIES_INFO_VERSION_KEY = "categories:info:version"
+VERSIONS_EPOCH_KEY = "versions:epoch"
+
+class CachedValue(NamedTuple):
+    value: Any
+    stale: bool = False
+
+class CachedPosts(NamedTuple):
+    posts: Dict[int, Dict[str, Any]]
+    versions: Dict[int, List[int]]
 
 def generate_post_key(post_id: int) -> str:
-    return f"post:{post_id}"
+    return f"post:v3:{post_id}"
+
+def post_version_key(post_id: int) -> str:
+    return f"post:version:{post_id}"
+
+def post_cache_version_keys(post_id: int) -> List[str]:
+    return [post_version_key(post_id), CATEGORIES_INFO_VERSION_KEY]
+
+def comments_version_key(post_id: int) -> str:
+    return f"comments:post:{post_id}:version"
+
+async def get_versions(keys: List[str]) -> Optional[List[str]]:
+    try:
+        redis_client = get_async_redis()
+        epoch, *versions = await redis_client.mget([VERSIONS_EPOCH_KEY, *keys])
+        if epoch is None:
+            await redis_client.set(VERSIONS_EPOCH_KEY, uuid.uuid4().hex[:8], nx=True)
+            epoch, *versions = await redis_client.mget([VERSIONS_EPOCH_KEY, *keys])
+    except RedisError as e:
+        logger.warning("Redis error reading versions %s: %s", keys, e)
+        return None
+    return [epoch.decode(), *(version.decode() if version else "0" for version in versions)]
+
+async def bump_versions(*keys: str) -> None:
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+        await pipe.execute()
+    except RedisError as e:
+        logger.error("Redis error bumping versions %s: %s", keys, e)
+
+async def bump_categories_version() -> None:
+    await bump_versions(CATEGORIES_VERSION_KEY)
+
+async def bump_categories_info_version() -> None:
+    await bump_versions(CATEGORIES_VERSION_KEY, CATEGORIES_INFO_VERSION_KEY)
+
+async def bump_comments_version(post_id: int) -> None:
+    await bump_versions(comments_version_key(post_id))
 
 def generate_posts_list_key(filters: Optional[Dict[str, Any]] = None) -> str:
     if not filters:
-        return "posts:list:default"
+        return "posts:list:entry:default"
     
     filter_parts = []
     for key, value in sorted(filters.items()):
         if value is not None:
             filter_parts.append(f"{key}:{value}")
     
-    return f"posts:list:{':'.join(filter_parts)}"
+    return f"posts:list:entry:{':'.join(filter_parts)}"
+
+def lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+def pack_entry(value: Any, ttl: int, delta: float, version: Sequence[int] = ()) -> bytes:
+    return orjson.dumps({"value": value, "version": list(version), "delta": delta, "expires_at": time.time() + ttl})
+
+def entry_ttl(ttl: int) -> int:
+    return ttl + settings.CACHE_STALE_TTL
+
+set_cache_entry_lifetime("posts_list", entry_ttl(POSTS_LIST_CACHE_TTL))
+set_cache_entry_lifetime("post", entry_ttl(POST_CACHE_TTL))
+
+def decode_versions(values: Sequence[Optional[bytes]]) -> List[int]:
+    return [int(value) if value else 0 for value in values]
+
+def is_fresh(entry: Dict[str, Any], version: Sequence[int] = ()) -> bool:
+    return entry["version"] == list(version) and time.time() < entry["expires_at"]
+
+def refresh_early(entry: Dict[str, Any]) -> bool:
+    return time.time() - entry["delta"] * settings.CACHE_XFETCH_BETA * math.log(1.0 - random.random()) >= entry["expires_at"]
+
+async def read_versions(version_keys: Sequence[str]) -> List[int]:
+    return decode_versions(await get_async_redis().mget(version_keys)) if version_keys else []
+
+async def read_entry(key: str, version_keys: Sequence[str] = ()) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+    entry, *versions = await get_async_redis().mget([key, *version_keys])
+    return (orjson.loads(entry) if entry else None), decode_versions(versions)
 
-def cache_post(post: Dict[str, Any]) -> None:
+async def acquire_lock(key: str) -> bool:
+    try:
+        return bool(await get_async_redis().set(lock_key(key), 1, nx=True, px=int(settings.CACHE_LOCK_TIMEOUT * 1000)))
+    except RedisError as e:
+        logger.warning("Redis error locking %s: %s", key, e)
+        return True
+
+async def release_lock(key: str) -> None:
+    try:
+        await get_async_redis().delete(lock_key(key))
+    except RedisError as e:
+        logger.warning("Redis error unlocking %s: %s", key, e)
+
+async def wait_for_entry(key: str, version: Sequence[int] = ()) -> Optional[Dict[str, Any]]:
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        try:
+            entry, locked = await get_async_redis().mget([key, lock_key(key)])
+        except RedisError as e:
+            logger.warning("Redis error waiting for %s: %s", key, e)
+            return None
+        if entry:
+            entry = orjson.loads(entry)
+            if is_fresh(entry, version):
+                return entry
+        if not locked:
+            return None
+    return None
+
+async def load_and_store(
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    store: Callable[[Any, float, List[int]], Awaitable[None]],
+    version: List[int]
+) -> Any:
+    started_at = time.perf_counter()
+    try:
+        value = await load()
+    except BaseException:
+        await release_lock(key)
+        raise
+    await store(value, time.perf_counter() - started_at, version)
+    return value
+
+async def read_through(
+    function: str,
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    store: Callable[[Any, float, List[int]], Awaitable[None]],
+    version_keys: Sequence[str] = (),
+    serve_stale_versions: bool = True
+) -> CachedValue:
+    try:
+        entry, version = await read_entry(key, version_keys)
+    except RedisError as e:
+        logger.warning("Redis error reading %s: %s", key, e)
+        record_cache(function, "error")
+        return CachedValue(await load())
+
+    if entry is not None and is_fresh(entry, version):
+        if not refresh_early(entry) or not await acquire_lock(key):
+            record_cache(function, "hit")
+            return CachedValue(entry["value"])
+        record_cache(function, "early_refresh")
+        return CachedValue(await load_and_store(key, load, store, version))
+
+    if await acquire_lock(key):
+        record_cache(function, "miss")
+        return CachedValue(await load_and_store(key, load, store, version))
+
+    if entry is not None and (serve_stale_versions or entry["version"] == version):
+        record_cache(function, "stale")
+        return CachedValue(entry["value"], stale=True)
+
+    entry = await wait_for_entry(key, version)
+    if entry is not None:
+        record_cache(function, "wait")
+        return CachedValue(entry["value"])
+
+    record_cache(function, "wait_miss")
+    return CachedValue(await load_and_store(key, load, store, version))
+
+async def cache_post(post: Dict[str, Any], delta: float = 0.0, version: Optional[List[int]] = None) -> None:
     key = generate_post_key(post['id'])
-    redis_client.setex(key, 3600, json.dumps(post))
+    try:
+        if version is None:
+            version = await read_versions(post_cache_version_keys(post['id']))
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.setex(key, entry_ttl(POST_CACHE_TTL), pack_entry(post, POST_CACHE_TTL, delta, version))
+        pipe.delete(lock_key(key))
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error caching post %s: %s", post['id'], e)
 
-def cache_posts_list(posts: list, filters: Optional[Dict[str, Any]] = None) -> None:
+async def cache_posts(posts: List[Dict[str, Any]], versions: Dict[int, List[int]]) -> None:
+    try:
+        await setex_many_json({
+            generate_post_key(post['id']): {"value": post, "version": versions.get(post['id'], []), "delta": 0.0, "expires_at": time.time() + POST_CACHE_TTL}
+            for post in posts
+            if post['id'] in versions
+        }, entry_ttl(POST_CACHE_TTL))
+    except RedisError as e:
+        logger.warning("Redis error caching %s posts: %s", len(posts), e)
+
+async def cache_posts_list(posts: dict, filters: Optional[Dict[str, Any]] = None, version: Sequence[int] = (), delta: float = 0.0) -> None:
     key = generate_posts_list_key(filters)
-    redis_client.setex(key, 3600, json.dumps(posts))
+    
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.setex(key, entry_ttl(POSTS_LIST_CACHE_TTL), pack_entry(posts, POSTS_LIST_CACHE_TTL, delta, version))
+        pipe.delete(lock_key(key))
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error caching posts list %s: %s", key, e)
 
-def get_cached_post(post_id: int) -> Optional[Dict[str, Any]]:
-    key = generate_post_key(post_id)
-    cached_post = redis_client.get(key)
-    return json.loads(cached_post) if cached_post else None
+async def get_cached_post(post_id: int, load: Callable[[], Awaitable[Dict[str, Any]]]) -> CachedValue:
+    return await read_through(
+        "get_cached_post",
+        generate_post_key(post_id),
+        load,
+        lambda post, delta, version: cache_post(post, delta, version),
+        post_cache_version_keys(post_id),
+        serve_stale_versions=False
+    )
 
-def get_cached_posts_list(filters: Optional[Dict[str, Any]] = None) -> Optional[list]:
-    key = generate_posts_list_key(filters)
-    cached_posts = redis_client.get(key)
-    return json.loads(cached_posts) if cached_posts else None
+async def get_cached_posts(post_ids: List[int]) -> CachedPosts:
+    version_keys = [post_cache_version_keys(post_id) for post_id in post_ids]
+    try:
+        values = await get_async_redis().mget(
+            [generate_post_key(post_id) for post_id in post_ids] + [key for keys in version_keys for key in keys]
+        )
+    except RedisError as e:
+        logger.warning("Redis error reading %s posts: %s", len(post_ids), e)
+        record_cache("get_cached_posts", "error", len(post_ids))
+        return CachedPosts({}, {})
+
+    versions = {}
+    position = len(post_ids)
+    for post_id, keys in zip(post_ids, version_keys):
+        versions[post_id] = decode_versions(values[position:position + len(keys)])
+        position += len(keys)
+
+    found = {}
+    for post_id, cached_post in zip(post_ids, values):
+        if cached_post:
+            entry = orjson.loads(cached_post)
+            if is_fresh(entry, versions[post_id]):
+                found[post_id] = entry["value"]
+    record_cache("get_cached_posts", "hit", len(found))
+    record_cache("get_cached_posts", "miss", len(post_ids) - len(found))
+    return CachedPosts(found, versions)
+
+async def get_cached_posts_list(filters: Dict[str, Any], load: Callable[[], Awaitable[dict]]) -> CachedValue:
+    return await read_through(
+        "get_cached_posts_list",
+        generate_posts_list_key(filters),
+        load,
+        lambda posts, delta, version: cache_posts_list(posts, filters, version, delta),
+        [POSTS_LIST_VERSION_KEY]
+    )
+
+async def get_cached_response(key: Optional[str]) -> Optional[bytes]:
+    if key is None:
+        return None
+    try:
+        body = await get_async_redis().get(key)
+    except RedisError as e:
+        logger.warning("Redis error reading response %s: %s", key, e)
+        record_cache("get_cached_response", "error")
+        return None
+    record_cache("get_cached_response", "hit" if body else "miss")
+    return body
+
+async def cache_response(key: Optional[str], body: bytes) -> None:
+    if key is None:
+        return
+    try:
+        await get_async_redis().setex(key, RESPONSE_CACHE_TTL, body)
+    except RedisError as e:
+        logger.warning("Redis error caching response %s: %s", key, e)
+
+async def invalidate_post_cache(post_id: int) -> None:
+    await invalidate_post_caches([post_id])
 
-def invalidate_post_cache(post_id: int) -> None:
-    key = generate_post_key(post_id)
-    redis_client.delete(key)
+async def invalidate_post_caches(post_ids: Iterable[int]) -> None:
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.delete(*[generate_post_key(post_id) for post_id in post_ids])
+        for post_id in post_ids:
+            pipe.incr(post_version_key(post_id))
+        await pipe.execute()
+    except RedisError as e:
+        logger.error("Redis error invalidating posts %s: %s", post_ids, e)
+        return
+    record_cache_invalidation("post", len(post_ids))
 
-def invalidate_posts_list_cache() -> None:
-    for key in redis_client.keys("posts:list:*"):
-        redis_client.delete(key)
\ No newline at end of file
+async def invalidate_posts_list_cache() -> None:
+    try:
+        await get_async_redis().incr(POSTS_LIST_VERSION_KEY)
+    except RedisError as e:
+        logger.error("Redis error invalidating posts list cache: %s", e)
+        return
+    record_cache_invalidation("posts_list")
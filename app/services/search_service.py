@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.broadcast import WORKER_ID, publish, subscribe
+from app.core.database import AsyncSessionLocal
+from app.core.redis_client import get_async_redis
+from app.core.search_index import InvertedIndex
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_CHANNEL = "search:index"
+SEARCH_BUILD_LOCK_KEY = "search:index:build"
+SEARCH_BUILD_POLL_INTERVAL = 1.0
+
+def new_search_index() -> InvertedIndex:
+    return InvertedIndex(
+        title_boost=settings.SEARCH_TITLE_BOOST,
+        common_term_ratio=settings.SEARCH_COMMON_TERM_RATIO
+    )
+
+search_index = new_search_index()
+_pending_events: Optional[List[Dict[str, Any]]] = None
+_index_write_lock = asyncio.Lock()
+
+def get_search_index() -> InvertedIndex:
+    return search_index
+
+def apply_event_to(index: InvertedIndex, event: Dict[str, Any]) -> None:
+    if event["op"] == "upsert":
+        index.add_many(event["posts"])
+    elif event["op"] == "delete":
+        for post_id in event["ids"]:
+            index.remove(post_id)
+
+def apply_events_to(index: InvertedIndex, events: List[Dict[str, Any]]) -> None:
+    for event in events:
+        apply_event_to(index, event)
+
+async def apply_index_event(event: Dict[str, Any]) -> None:
+    if _pending_events is not None:
+        _pending_events.append(event)
+    # Index writes run off the event loop; the FIFO lock keeps them in order.
+    async with _index_write_lock:
+        await asyncio.to_thread(apply_event_to, search_index, event)
+
+async def replay_pending_events(index: InvertedIndex) -> None:
+    replayed = 0
+    while replayed < len(_pending_events):
+        events = _pending_events[replayed:]
+        replayed += len(events)
+        await asyncio.to_thread(apply_events_to, index, events)
+
+async def index_posts(posts: Iterable[Post]) -> None:
+    event = {"op": "upsert", "posts": [(post.id, post.title, post.content) for post in posts]}
+    if not event["posts"]:
+        return
+
+    await apply_index_event(event)
+    await publish(SEARCH_INDEX_CHANNEL, event)
+
+async def index_post(post: Post) -> None:
+    await index_posts([post])
+
+async def remove_posts_from_index(post_ids: List[int]) -> None:
+    event = {"op": "delete", "ids": list(post_ids)}
+    await apply_index_event(event)
+    await publish(SEARCH_INDEX_CHANNEL, event)
+
+async def discard_from_index(post_ids: List[int]) -> None:
+    async with _index_write_lock:
+        await asyncio.to_thread(apply_event_to, search_index, {"op": "delete", "ids": post_ids})
+
+async def rebuild_search_index(db: AsyncSession) -> int:
+    global search_index, _pending_events
+
+    index = new_search_index()
+    _pending_events = []
+    try:
+        result = await db.stream(
+            select(Post.id, Post.title, Post.content)
+            .execution_options(yield_per=settings.SEARCH_REBUILD_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            await asyncio.to_thread(index.add_many, [tuple(row) for row in rows])
+
+        await replay_pending_events(index)
+        search_index = index
+    finally:
+        _pending_events = None
+
+    logger.info("Search index rebuilt with %s posts", len(index))
+    return len(index)
+
+def write_snapshot(path: str, saved_at: datetime, index: InvertedIndex) -> None:
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=f"{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as snapshot_file:
+            snapshot_file.write(orjson.dumps({"saved_at": saved_at.isoformat(), "index": index.snapshot()}))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+def read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as snapshot_file:
+        state = orjson.loads(snapshot_file.read())
+
+    return {
+        "saved_at": datetime.fromisoformat(state["saved_at"]),
+        "index": InvertedIndex.from_snapshot(state["index"], common_term_ratio=settings.SEARCH_COMMON_TERM_RATIO)
+    }
+
+async def drop_deleted_posts(db: AsyncSession, index: InvertedIndex) -> int:
+    doc_ids = sorted(index.doc_lengths)
+    removed = 0
+    for chunk_start in range(0, len(doc_ids), settings.SEARCH_REBUILD_CHUNK_SIZE):
+        chunk = doc_ids[chunk_start:chunk_start + settings.SEARCH_REBUILD_CHUNK_SIZE]
+        existing_ids = set(await db.scalars(select(Post.id).where(Post.id.in_(chunk))))
+        deleted_ids = [doc_id for doc_id in chunk if doc_id not in existing_ids]
+        if deleted_ids:
+            await asyncio.to_thread(apply_event_to, index, {"op": "delete", "ids": deleted_ids})
+            removed += len(deleted_ids)
+    return removed
+
+async def acquire_build_lock() -> bool:
+    try:
+        return bool(await get_async_redis().set(
+            SEARCH_BUILD_LOCK_KEY, WORKER_ID, nx=True, px=settings.SEARCH_BUILD_LOCK_TIMEOUT * 1000
+        ))
+    except RedisError as e:
+        logger.warning("Redis error locking the search index build: %s", e)
+        return True
+
+async def release_build_lock() -> None:
+    try:
+        redis = get_async_redis()
+        if await redis.get(SEARCH_BUILD_LOCK_KEY) == WORKER_ID.encode():
+            await redis.delete(SEARCH_BUILD_LOCK_KEY)
+    except RedisError as e:
+        logger.warning("Redis error unlocking the search index build: %s", e)
+
+async def save_search_index(db: AsyncSession) -> bool:
+    if not settings.SEARCH_INDEX_PATH:
+        return False
+
+    saved_at = await db.scalar(select(func.now()))
+    await asyncio.to_thread(write_snapshot, settings.SEARCH_INDEX_PATH, saved_at, search_index)
+
+    return True
+
+async def load_search_index(db: AsyncSession) -> bool:
+    global search_index, _pending_events
+
+    if not settings.SEARCH_INDEX_PATH:
+        return False
+
+    _pending_events = []
+    try:
+        try:
+            snapshot = await asyncio.to_thread(read_snapshot, settings.SEARCH_INDEX_PATH)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Search index snapshot %s is unreadable, rebuilding: %s", settings.SEARCH_INDEX_PATH, e)
+            return False
+        if snapshot is None:
+            return False
+
+        index = snapshot["index"]
+        saved_at = snapshot["saved_at"]
+        changed_posts = await db.execute(
+            select(Post.id, Post.title, Post.content)
+            .where(or_(Post.created_at >= saved_at, Post.updated_at >= saved_at))
+        )
+        await asyncio.to_thread(index.add_many, [tuple(row) for row in changed_posts])
+        removed = await drop_deleted_posts(db, index)
+
+        await replay_pending_events(index)
+        search_index = index
+    finally:
+        _pending_events = None
+
+    logger.info("Search index loaded from %s with %s posts, dropped %s deleted posts", settings.SEARCH_INDEX_PATH, len(index), removed)
+    return True
+
+async def build_search_index(db: AsyncSession) -> None:
+    if not settings.SEARCH_INDEX_PATH:
+        await rebuild_search_index(db)
+        return
+
+    # One worker rebuilds and writes the snapshot; the others wait for it and
+    # load it instead of each reading every post from the database.
+    if await acquire_build_lock():
+        try:
+            await rebuild_search_index(db)
+            await save_search_index(db)
+        finally:
+            await release_build_lock()
+        return
+
+    deadline = time.monotonic() + settings.SEARCH_BUILD_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(SEARCH_BUILD_POLL_INTERVAL)
+        if await load_search_index(db):
+            return
+        try:
+            if not await get_async_redis().exists(SEARCH_BUILD_LOCK_KEY):
+                break
+        except RedisError:
+            break
+
+    await rebuild_search_index(db)
+
+class SearchIndexer:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+        self.ready = False
+
+    def start(self) -> None:
+        if self.task is None:
+            subscribe(SEARCH_INDEX_CHANNEL, apply_index_event)
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                if not await load_search_index(db):
+                    await build_search_index(db)
+            self.ready = True
+        except Exception as e:
+            logger.error("Search index build error: %s", e)
+
+        if not self.ready or not settings.SEARCH_INDEX_PATH:
+            return
+
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=settings.SEARCH_SNAPSHOT_INTERVAL)
+            except asyncio.TimeoutError:
+                await self.save()
+
+    async def save(self) -> None:
+        # Workers hold the same index, so only the one holding the build lock
+        # writes the shared snapshot file.
+        if not await acquire_build_lock():
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await save_search_index(db)
+        except Exception as e:
+            logger.error("Search index snapshot error: %s", e)
+        finally:
+            await release_build_lock()
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
+        if self.ready:
+            await self.save()
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis_client import get_async_redis
+from app.models.follow import AuthorFollow, CategoryFollow
+from app.services.counter_service import followers_by_author_key, followers_by_category_key, get_counter
+
+logger = logging.getLogger(__name__)
+
+FEED_SENTINEL = 0
+
+def user_feed_key(user_id: int) -> str:
+    return f"feed:user:{user_id}"
+
+def author_timeline_key(author_id: int) -> str:
+    return f"timeline:author:{author_id}"
+
+def category_timeline_key(category_id: int) -> str:
+    return f"timeline:category:{category_id}"
+
+def is_heavy(follower_count: Optional[int]) -> bool:
+    return (follower_count or 0) >= settings.FEED_FANOUT_MAX_FOLLOWERS
+
+async def push_to_timelines(keys: Iterable[str], post_ids: List[int]) -> None:
+    if not post_ids:
+        return
+
+    members = {post_id: post_id for post_id in post_ids}
+    pipe = get_async_redis().pipeline(transaction=False)
+    for key in keys:
+        pipe.zadd(key, members)
+        pipe.zremrangebyrank(key, 0, -(settings.FEED_MAX_LENGTH + 1))
+    await pipe.execute()
+
+async def push_to_feeds(user_ids: List[int], post_ids: List[int]) -> int:
+    if not user_ids or not post_ids:
+        return 0
+
+    redis_client = get_async_redis()
+    pipe = redis_client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.exists(user_feed_key(user_id))
+    feed_keys = [user_feed_key(user_id) for user_id, exists in zip(user_ids, await pipe.execute()) if exists]
+    if not feed_keys:
+        return 0
+
+    members = {post_id: post_id for post_id in post_ids}
+    pipe = redis_client.pipeline(transaction=False)
+    for key in feed_keys:
+        pipe.zadd(key, members)
+        pipe.zremrangebyrank(key, 1, -(settings.FEED_MAX_LENGTH + 2))
+        pipe.expire(key, settings.FEED_TTL, nx=True)
+    await pipe.execute()
+    return len(feed_keys)
+
+async def replace_feed(user_id: int, post_ids: List[int]) -> None:
+    key = user_feed_key(user_id)
+    pipe = get_async_redis().pipeline(transaction=True)
+    pipe.delete(key)
+    pipe.zadd(key, {FEED_SENTINEL: FEED_SENTINEL, **{post_id: post_id for post_id in post_ids}})
+    pipe.expire(key, settings.FEED_TTL)
+    await pipe.execute()
+
+async def add_to_feed(user_id: int, post_ids: List[int]) -> None:
+    try:
+        await push_to_feeds([user_id], post_ids)
+    except RedisError as e:
+        logger.warning("Redis error adding to feed of user %s: %s", user_id, e)
+
+async def remove_from_feed(user_id: int, post_ids: List[int]) -> None:
+    try:
+        if post_ids:
+            await get_async_redis().zrem(user_feed_key(user_id), *post_ids)
+    except RedisError as e:
+        logger.warning("Redis error removing from feed of user %s: %s", user_id, e)
+
+async def remove_from_timelines(post_id: int, author_id: int, category_id: Optional[int]) -> None:
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.zrem(author_timeline_key(author_id), post_id)
+        if category_id is not None:
+            pipe.zrem(category_timeline_key(category_id), post_id)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error removing post %s from timelines: %s", post_id, e)
+
+async def move_between_category_timelines(post_id: int, old_category_id: Optional[int], new_category_id: Optional[int]) -> None:
+    try:
+        if old_category_id is not None:
+            await get_async_redis().zrem(category_timeline_key(old_category_id), post_id)
+        if new_category_id is not None:
+            await push_to_timelines([category_timeline_key(new_category_id)], [post_id])
+    except RedisError as e:
+        logger.warning("Redis error moving post %s between category timelines: %s", post_id, e)
+
+async def fan_out_posts(db: AsyncSession, author_id: int, posts: List[Tuple[int, Optional[int]]]) -> int:
+    post_ids_by_category: Dict[int, List[int]] = defaultdict(list)
+    for post_id, category_id in posts:
+        if category_id is not None:
+            post_ids_by_category[category_id].append(post_id)
+
+    sources = [(
+        author_timeline_key(author_id),
+        followers_by_author_key(author_id),
+        select(AuthorFollow.follower_id).where(AuthorFollow.author_id == author_id),
+        [post_id for post_id, _ in posts]
+    )] + [(
+        category_timeline_key(category_id),
+        followers_by_category_key(category_id),
+        select(CategoryFollow.follower_id).where(CategoryFollow.category_id == category_id),
+        post_ids
+    ) for category_id, post_ids in post_ids_by_category.items()]
+
+    delivered = 0
+    for timeline_key, counter_name, followers_query, post_ids in sources:
+        await push_to_timelines([timeline_key], post_ids)
+
+        if is_heavy(await get_counter(db, counter_name)):
+            continue
+
+        result = await db.stream_scalars(followers_query.execution_options(yield_per=settings.FEED_FANOUT_BATCH_SIZE))
+        async for follower_ids in result.partitions():
+            delivered += await push_to_feeds(list(follower_ids), post_ids)
+
+    return delivered
+
+class FeedFanout:
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.task is None:
+            self.queue = asyncio.Queue(maxsize=settings.FEED_FANOUT_QUEUE_SIZE)
+            self.task = asyncio.create_task(self.run())
+
+    async def enqueue(self, author_id: int, posts: List[Tuple[int, Optional[int]]]) -> bool:
+        if self.queue is None or not posts:
+            return False
+        try:
+            self.queue.put_nowait((author_id, posts))
+        except asyncio.QueueFull:
+            logger.warning("Feed fan-out queue full, dropping %s posts of author %s", len(posts), author_id)
+            return False
+        return True
+
+    async def run(self) -> None:
+        while True:
+            job = await self.queue.get()
+            if job is None:
+                return
+
+            author_id, posts = job
+            try:
+                async with AsyncSessionLocal() as db:
+                    await fan_out_posts(db, author_id, posts)
+            except Exception as e:
+                logger.error("Feed fan-out error for author %s: %s", author_id, e)
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+            self.queue = None
+
+feed_fanout = FeedFanout()
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+import time
+from typing import List, Optional
+from redis.exceptions import RedisError
+from app.config import settings
+from app.core.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+TRENDING_KEY = "trending:posts"
+TRENDING_CATEGORIES_KEY = "trending:categories"
+TRENDING_LANDMARK_KEY = "trending:landmark"
+TRENDING_COMPACTION_LOCK_KEY = "trending:compaction:lock"
+LANDMARK_CACHE_SECONDS = 5.0
+
+ENGAGEMENT_WEIGHTS = {
+    "like": 1.0,
+    "unlike": -1.0,
+    "comment": 2.0,
+    "bookmark": 3.0
+}
+
+_landmark = {"value": None, "fetched_at": 0.0}
+
+def category_trending_key(category_id: int) -> str:
+    return f"trending:category:{category_id}"
+
+def decay_tau() -> float:
+    return settings.TRENDING_HALF_LIFE / math.log(2)
+
+async def get_landmark(refresh: bool = False) -> float:
+    now = time.monotonic()
+    if not refresh and _landmark["value"] is not None and now - _landmark["fetched_at"] < LANDMARK_CACHE_SECONDS:
+        return _landmark["value"]
+
+    redis_client = get_async_redis()
+    value = await redis_client.get(TRENDING_LANDMARK_KEY)
+    if value is None:
+        await redis_client.set(TRENDING_LANDMARK_KEY, time.time(), nx=True)
+        value = await redis_client.get(TRENDING_LANDMARK_KEY)
+
+    _landmark["value"] = float(value)
+    _landmark["fetched_at"] = now
+    return _landmark["value"]
+
+async def record_engagement(post_id: int, category_id: Optional[int], event: str) -> None:
+    try:
+        landmark = await get_landmark()
+        delta = ENGAGEMENT_WEIGHTS[event] * math.exp((time.time() - landmark) / decay_tau())
+
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.zincrby(TRENDING_KEY, delta, post_id)
+        if category_id is not None:
+            pipe.zincrby(category_trending_key(category_id), delta, post_id)
+            pipe.sadd(TRENDING_CATEGORIES_KEY, category_id)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error recording %s on post %s: %s", event, post_id, e)
+
+async def remove_from_trending(post_id: int, category_id: Optional[int]) -> None:
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.zrem(TRENDING_KEY, post_id)
+        if category_id is not None:
+            pipe.zrem(category_trending_key(category_id), post_id)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error removing post %s from trending: %s", post_id, e)
+
+async def move_trending_category(post_id: int, old_category_id: Optional[int], new_category_id: Optional[int]) -> None:
+    try:
+        redis_client = get_async_redis()
+        score = await redis_client.zscore(TRENDING_KEY, post_id)
+
+        pipe = redis_client.pipeline(transaction=False)
+        if old_category_id is not None:
+            pipe.zrem(category_trending_key(old_category_id), post_id)
+        if new_category_id is not None and score is not None:
+            pipe.zadd(category_trending_key(new_category_id), {post_id: score})
+            pipe.sadd(TRENDING_CATEGORIES_KEY, new_category_id)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("Redis error moving post %s between trending categories: %s", post_id, e)
+
+async def get_trending_post_ids(category_id: Optional[int] = None, limit: int = 10) -> List[int]:
+    key = category_trending_key(category_id) if category_id is not None else TRENDING_KEY
+    try:
+        return [int(post_id) for post_id in await get_async_redis().zrevrange(key, 0, limit - 1)]
+    except RedisError as e:
+        logger.warning("Redis error reading trending posts: %s", e)
+        return []
+
+async def compact_trending() -> int:
+    redis_client = get_async_redis()
+    if not await redis_client.set(TRENDING_COMPACTION_LOCK_KEY, 1, nx=True, ex=max(1, settings.TRENDING_COMPACT_INTERVAL // 2)):
+        return 0
+
+    now = time.time()
+    landmark = await get_landmark(refresh=True)
+    factor = math.exp(-(now - landmark) / decay_tau())
+
+    category_ids = await redis_client.smembers(TRENDING_CATEGORIES_KEY)
+    keys = [TRENDING_KEY] + [category_trending_key(int(category_id)) for category_id in category_ids]
+
+    pipe = redis_client.pipeline(transaction=True)
+    for key in keys:
+        pipe.zunionstore(key, {key: factor})
+        pipe.zremrangebyscore(key, "-inf", settings.TRENDING_MIN_SCORE)
+        pipe.zremrangebyrank(key, 0, -(settings.TRENDING_MAX_SIZE + 1))
+    pipe.set(TRENDING_LANDMARK_KEY, now)
+    await pipe.execute()
+
+    _landmark["value"] = now
+    _landmark["fetched_at"] = time.monotonic()
+    return len(keys)
+
+class TrendingCompactor:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=settings.TRENDING_COMPACT_INTERVAL)
+            except asyncio.TimeoutError:
+                try:
+                    await compact_trending()
+                except RedisError as e:
+                    logger.error("Trending compaction error: %s", e)
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import HTTPException, status
+from app.core.security import invalidate_user_record
+from app.models.user import User, UserRole
 from app.schemas.user import UserCreate
 
-def create_user(db: Session, user: UserCreate, hashed_password: str):
+async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str):
     db_user = User(
         username=user.username,
         email=user.email,
@@ -10,12 +13,32 @@ def create_user(db: Session, user: UserCreate, hashed_password: str):
         role=user.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    return await db.scalar(select(User).where(User.username == username))
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
\ No newline at end of file
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(User).where(User.email == email))
+
+async def update_password_hash(db: AsyncSession, db_user: User, hashed_password: str):
+    db_user.hashed_password = hashed_password
+    await db.commit()
+    return db_user
+
+async def update_user_role(db: AsyncSession, user_id: int, role: UserRole):
+    db_user = await db.scalar(select(User).where(User.id == user_id))
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    db_user.role = role
+    await db.commit()
+    await db.refresh(db_user)
+    
+    await invalidate_user_record(user_id)
+    return db_user
@@ -0,0 +1,373 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+BENCHMARK_DIR = tempfile.mkdtemp(prefix="blog-benchmark-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{BENCHMARK_DIR}/benchmark.db")
+os.environ.setdefault("KAFKA_TRANSPORT", "memory")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("METRICS_SQL_STATEMENT_BUDGET", "0")
+
+import fakeredis
+import httpx
+from sqlalchemy import event
+from app.config import settings
+from app.core.database import AsyncSessionLocal, async_engine, create_sync_engine
+from app.core.password_hashing import hash_password_sync
+from app.core.redis_client import set_redis_clients
+from app.core.security import create_access_token
+from app.models import Base
+from app.models.bookmark import Bookmark
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.post import Post, post_likes
+from app.models.user import User, UserRole
+from app.services.counter_service import rebuild_counters
+from app.services.redis_cache_service import invalidate_posts_list_cache
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "api_suite_baseline.json")
+PASSWORD = "benchmark-password"
+PAGE_SIZE = 20
+INSERT_BATCH_SIZE = 5000
+# Scenarios that mostly miss the cache (random first reads, list invalidated on
+# every request) measure cache fills and scans, which swing far more between
+# runs than warm reads do.
+COLD_MAX_REGRESSION = 0.75
+
+RequestSpec = Tuple[str, str, dict]
+Scenario = Callable[[dict, int], Awaitable[RequestSpec]]
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def configure_sqlite(dbapi_connection, connection_record) -> None:
+    if async_engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+def batched(rows: list, size: int = INSERT_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def seed(users: int, categories: int, posts: int, comments: int, likes: int, bookmarks: int, rng: random.Random) -> dict:
+    now = datetime.utcnow()
+    hashed_password = hash_password_sync(PASSWORD)
+    post_ids = list(range(1, posts + 1))
+    hot_post_id = post_ids[0]
+
+    like_pairs = {(rng.randint(1, users), rng.choice(post_ids)) for _ in range(likes)}
+    likes_count = Counter(post_id for _, post_id in like_pairs)
+
+    tables = [
+        (User.__table__, [
+            {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com", "hashed_password": hashed_password, "role": UserRole.USER}
+            for user_id in range(1, users + 1)
+        ]),
+        (Category.__table__, [
+            {"id": category_id, "name": f"Category {category_id}", "description": "benchmark"}
+            for category_id in range(1, categories + 1)
+        ]),
+        (Post.__table__, [
+            {
+                "id": post_id,
+                "title": f"Benchmark post {post_id}",
+                "content": "benchmark content " * 20,
+                "author_id": rng.randint(1, users),
+                "category_id": rng.randint(1, categories),
+                "created_at": now - timedelta(seconds=rng.randint(0, 30 * 86400)),
+                "likes_count": likes_count[post_id]
+            }
+            for post_id in post_ids
+        ]),
+        (Comment.__table__, [
+            {
+                "id": comment_id,
+                "content": "benchmark comment",
+                "post_id": hot_post_id if comment_id % 10 == 0 else rng.choice(post_ids),
+                "author_id": rng.randint(1, users),
+                "created_at": now - timedelta(seconds=rng.randint(0, 30 * 86400)),
+                "root_id": comment_id,
+                "depth": 0,
+                "path": f"{comment_id:010d}/"
+            }
+            for comment_id in range(1, comments + 1)
+        ]),
+        (post_likes, [{"user_id": user_id, "post_id": post_id} for user_id, post_id in like_pairs]),
+        (Bookmark.__table__, [
+            {"user_id": 1, "post_id": post_id, "created_at": now - timedelta(seconds=index)}
+            for index, post_id in enumerate(rng.sample(post_ids, min(bookmarks, posts)))
+        ])
+    ]
+
+    engine = create_sync_engine()
+    try:
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            for table, rows in tables:
+                for batch in batched(rows):
+                    connection.execute(table.insert(), batch)
+    finally:
+        engine.dispose()
+
+    return {"users": users, "post_ids": post_ids, "hot_post_id": hot_post_id}
+
+async def finish_seed() -> None:
+    async with AsyncSessionLocal() as db:
+        await rebuild_counters(db)
+
+def auth_headers(user_id: int) -> dict:
+    token = create_access_token(
+        data={"sub": f"user{user_id}", "uid": user_id, "role": UserRole.USER.value},
+        expires_delta=timedelta(hours=1)
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+async def read_post(context: dict, index: int) -> RequestSpec:
+    return "GET", f"/posts/{context['rng'].choice(context['post_ids'])}", {}
+
+async def list_posts_warm(context: dict, index: int) -> RequestSpec:
+    return "GET", f"/posts/?limit={PAGE_SIZE}", {}
+
+async def list_posts_cold(context: dict, index: int) -> RequestSpec:
+    await invalidate_posts_list_cache()
+    return "GET", f"/posts/?limit={PAGE_SIZE}", {}
+
+async def list_posts_deep(context: dict, index: int) -> RequestSpec:
+    await invalidate_posts_list_cache()
+    return "GET", "/posts/", {"params": {"limit": PAGE_SIZE, "cursor": context["deep_cursor"]}}
+
+async def like_storm(context: dict, index: int) -> RequestSpec:
+    return "POST", f"/posts/{context['hot_post_id']}/like", {"headers": context["headers"][index % len(context["headers"])]}
+
+async def comment_burst(context: dict, index: int) -> RequestSpec:
+    return "POST", f"/comments/posts/{context['hot_post_id']}", {
+        "headers": context["headers"][index % len(context["headers"])],
+        "json": {"content": f"burst comment {index}"}
+    }
+
+async def bookmark_listing(context: dict, index: int) -> RequestSpec:
+    return "GET", f"/bookmarks/?limit={PAGE_SIZE}", {"headers": context["headers"][0]}
+
+async def login(context: dict, index: int) -> RequestSpec:
+    user_id = index % context["users"] + 1
+    return "POST", "/auth/token", {"data": {"username": f"user{user_id}", "password": PASSWORD}}
+
+# name -> (scenario, default concurrency, allowed regression; None uses --max-regression)
+SCENARIOS: Dict[str, Tuple[Scenario, int, Optional[float]]] = {
+    "read_post": (read_post, 8, COLD_MAX_REGRESSION),
+    "list_posts_cold": (list_posts_cold, 8, COLD_MAX_REGRESSION),
+    "list_posts_warm": (list_posts_warm, 8, None),
+    "list_posts_deep": (list_posts_deep, 8, COLD_MAX_REGRESSION),
+    "like_storm": (like_storm, 32, None),
+    "comment_burst": (comment_burst, 32, None),
+    "bookmark_listing": (bookmark_listing, 8, None),
+    "login": (login, 8, None)
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def run_scenario(client: httpx.AsyncClient, context: dict, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            method, url, options = await scenario(context, index)
+            started = time.perf_counter()
+            response = await client.request(method, url, **options)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3)
+    }
+
+def median_run(runs: List[dict]) -> dict:
+    return {
+        key: statistics.median(run[key] for run in runs) if isinstance(runs[0][key], float) else runs[0][key]
+        for key in runs[0]
+    } | {"errors": max(run["errors"] for run in runs)}
+
+async def deep_page_cursor(client: httpx.AsyncClient, pages: int) -> Optional[str]:
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": PAGE_SIZE, "include_total": False}
+        if cursor:
+            params["cursor"] = cursor
+        next_cursor = (await client.get("/posts/", params=params)).json()["next_cursor"]
+        if not next_cursor:
+            break
+        cursor = next_cursor
+    return cursor
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    context = seed(args.users, args.categories, args.posts, args.comments, args.likes, args.bookmarks, rng)
+    await finish_seed()
+    set_redis_clients(fakeredis.FakeRedis(), fakeredis.FakeAsyncRedis())
+
+    context["rng"] = rng
+    context["headers"] = [auth_headers(user_id) for user_id in range(1, args.users + 1)]
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            context["deep_cursor"] = await deep_page_cursor(client, args.deep_page)
+
+            for name in args.scenarios:
+                scenario, default_concurrency, _ = SCENARIOS[name]
+                concurrency = args.concurrency or default_concurrency
+                await run_scenario(client, context, scenario, args.warmup, concurrency)
+                runs = [await run_scenario(client, context, scenario, args.requests, concurrency) for _ in range(args.repeat)]
+                results[name] = median_run(runs)
+                print(f"{name}: {results[name]['throughput_rps']} req/s, p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+
+    return {
+        "config": {
+            "users": args.users,
+            "categories": args.categories,
+            "posts": args.posts,
+            "comments": args.comments,
+            "likes": args.likes,
+            "bookmarks": args.bookmarks,
+            "requests": args.requests,
+            "repeat": args.repeat,
+            "deep_page": args.deep_page,
+            "seed": args.seed,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS
+        },
+        "hardware": hardware_fingerprint(),
+        "scenarios": results
+    }
+
+def cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+def hardware_fingerprint() -> dict:
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version()
+    }
+
+def mismatched_keys(current: dict, baseline: dict) -> List[str]:
+    return sorted(key for key in current.keys() | baseline.keys() if current.get(key) != baseline.get(key))
+
+def find_regressions(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    mismatched = mismatched_keys(results["config"], baseline.get("config", {}))
+    if mismatched:
+        return [
+            f"baseline was recorded with a different configuration ({', '.join(mismatched)}); "
+            "rerun with the baseline's options, re-record it with --update-baseline or pass --no-baseline"
+        ]
+
+    # Latencies are only comparable on the machine that recorded them.
+    mismatched = mismatched_keys(results["hardware"], baseline.get("hardware", {}))
+    if mismatched:
+        return [
+            f"baseline was recorded on different hardware ({', '.join(mismatched)}); "
+            "re-record it on this machine with --update-baseline or pass --no-baseline"
+        ]
+
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        allowed = SCENARIOS[name][2]
+        allowed = max_regression if allowed is None else max(allowed, max_regression)
+        if current["p95_ms"] > previous["p95_ms"] * (1 + allowed):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms vs baseline {previous['p95_ms']} ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - allowed):
+            regressions.append(f"{name}: throughput {current['throughput_rps']} req/s vs baseline {previous['throughput_rps']} req/s")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors vs baseline {previous['errors']}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline latency/throughput suite for the HTTP API (SQLite, fakeredis, in-memory Kafka)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=20000)
+    parser.add_argument("--likes", type=int, default=20000)
+    parser.add_argument("--bookmarks", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="measured runs per scenario; the median of each metric is reported")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=None, help="override each scenario's default concurrency")
+    parser.add_argument("--deep-page", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--max-regression", type=float, default=0.35, help="allowed relative p95/throughput regression for warm scenarios; cold ones allow at least COLD_MAX_REGRESSION")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--no-baseline", action="store_true", help="only measure; skip the comparison with the baseline")
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(BENCHMARK_DIR, ignore_errors=True)
+    output = json.dumps(results, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            baseline_file.write(output + "\n")
+    elif not args.no_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"REGRESSION no baseline at {args.baseline}; record one with --update-baseline or pass --no-baseline", file=sys.stderr)
+            sys.exit(1)
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,43 @@
+import argparse
+import json
+import time
+from app.config import settings
+from app.core.kafka_producer import InMemoryTransport, KafkaNotificationProducer
+
+def run(messages: int, batch_size: int) -> dict:
+    KafkaNotificationProducer.shutdown()
+    transport = InMemoryTransport()
+    producer = KafkaNotificationProducer(transport=transport)
+
+    payloads = [
+        (
+            settings.KAFKA_NOTIFICATION_TOPIC,
+            str(index % 1000),
+            json.dumps({"user_id": index % 1000, "message": "benchmark", "type": "post_like", "related_id": index}).encode("utf-8")
+        )
+        for index in range(messages)
+    ]
+
+    started = time.perf_counter()
+    delivered = 0
+    for batch_start in range(0, messages, batch_size):
+        delivered += sum(producer.send_batch(payloads[batch_start:batch_start + batch_size], settings.OUTBOX_DELIVERY_TIMEOUT))
+    total_seconds = time.perf_counter() - started
+    stats = producer.get_stats()
+    KafkaNotificationProducer.shutdown()
+
+    return {
+        "messages": messages,
+        "batch_size": batch_size,
+        "delivered_per_second": round(delivered / total_seconds),
+        "mean_batch_latency_ms": round(total_seconds / max(stats["batches"], 1) * 1000, 3),
+        "stats": stats
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for batched outbox delivery through the notification producer")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.messages, args.batch_size), indent=2))
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import json
+import time
+from app.config import settings
+from app.core import password_hashing
+
+async def measure(workers: int, logins: int, hashed_password: str) -> dict:
+    settings.PASSWORD_HASH_WORKERS = workers
+    settings.PASSWORD_HASH_MAX_PENDING = logins
+    password_hashing.shutdown_executor()
+
+    await asyncio.gather(*[
+        password_hashing.verify_and_update_password("benchmark-password", hashed_password)
+        for _ in range(workers * 2)
+    ])
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        password_hashing.verify_and_update_password("benchmark-password", hashed_password)
+        for _ in range(logins)
+    ])
+    elapsed = time.perf_counter() - started
+    password_hashing.shutdown_executor()
+
+    assert all(verified for verified, _ in results)
+    return {
+        "workers": workers,
+        "logins": logins,
+        "logins_per_second": round(logins / elapsed, 2),
+        "mean_latency_ms": round(elapsed / logins * 1000, 2)
+    }
+
+async def main(worker_counts, logins: int) -> list:
+    hashed_password = password_hashing.hash_password_sync("benchmark-password")
+    return [await measure(workers, logins, hashed_password) for workers in worker_counts]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login (bcrypt verify) throughput vs. hash pool size")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "results": asyncio.run(main(args.workers, args.logins))
+    }, indent=2))
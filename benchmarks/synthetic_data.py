@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+from app.core.database import AsyncSessionLocal, async_engine, create_sync_engine
+from app.core.password_hashing import hash_password_sync
+from app.core.redis_client import close_redis_clients
+from app.models.bookmark import Bookmark
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.notification import Notification
+from app.models.post import Post, post_likes
+from app.models.user import User, UserRole
+from app.schemas.post import PostFilter
+from app.services.comment_service import COMMENT_MAX_DEPTH, comment_path_segment
+from app.services.counter_service import rebuild_counters
+from app.services.post_service import POSTS_BATCH_MAX_IDS, get_posts_by_ids, list_posts, recompute_likes_counts
+
+BURST_SHARE = 0.6
+BURST_WIDTH_SECONDS = 2 * 3600
+COMMENT_DELAY_SECONDS = 6 * 3600
+REPLY_SHARE = 0.3
+READ_NOTIFICATION_SHARE = 0.7
+
+class SyntheticData:
+    def __init__(self, args: argparse.Namespace, first_ids: Dict[str, int]):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.first_ids = first_ids
+        self.end = datetime.utcnow()
+        self.start = self.end - timedelta(days=args.days)
+        self.span = (self.end - self.start).total_seconds()
+        self.burst_centers = [self.rng.uniform(0, self.span) for _ in range(max(1, args.days * 4))]
+
+        self.user_ids = range(first_ids["users"], first_ids["users"] + args.users)
+        self.category_ids = range(first_ids["categories"], first_ids["categories"] + args.categories)
+        self.post_ids = range(first_ids["posts"], first_ids["posts"] + args.posts)
+        self.heavy_author_ids = self.rng.sample(self.user_ids, min(args.heavy_authors, args.users))
+
+        self.post_authors = array("i")
+        self.post_offsets = array("d")
+
+        ranked_post_ids = list(self.post_ids)
+        self.rng.shuffle(ranked_post_ids)
+        self.ranked_post_ids = ranked_post_ids
+        self.popularity = list(itertools.accumulate(1 / rank ** args.zipf_exponent for rank in range(1, args.posts + 1)))
+
+    def timestamp(self, offset: float) -> datetime:
+        return self.start + timedelta(seconds=min(offset, self.span))
+
+    def bursty_offset(self) -> float:
+        if self.rng.random() < BURST_SHARE:
+            return min(self.span, self.rng.choice(self.burst_centers) + self.rng.expovariate(1 / BURST_WIDTH_SECONDS))
+        return self.rng.uniform(0, self.span)
+
+    def popular_posts(self, count: int) -> List[int]:
+        return self.rng.choices(self.ranked_post_ids, cum_weights=self.popularity, k=count)
+
+    def users(self, hashed_password: str) -> Iterator[dict]:
+        for user_id in self.user_ids:
+            yield {
+                "id": user_id,
+                "username": f"load_{user_id}",
+                "email": f"load_{user_id}@example.com",
+                "hashed_password": hashed_password,
+                "role": UserRole.USER
+            }
+
+    def categories(self) -> Iterator[dict]:
+        for category_id in self.category_ids:
+            yield {"id": category_id, "name": f"Load category {category_id}", "description": "Synthetic category"}
+
+    def posts(self) -> Iterator[dict]:
+        offsets = sorted(self.bursty_offset() for _ in self.post_ids)
+        for post_id, offset in zip(self.post_ids, offsets):
+            if self.rng.random() < self.args.heavy_author_share:
+                author_id = self.rng.choice(self.heavy_author_ids)
+            else:
+                author_id = self.rng.choice(self.user_ids)
+            self.post_authors.append(author_id)
+            self.post_offsets.append(offset)
+
+            yield {
+                "id": post_id,
+                "title": f"Synthetic post {post_id}",
+                "content": " ".join(self.rng.choices(WORDS, k=self.rng.randint(20, 200))),
+                "author_id": author_id,
+                "category_id": self.rng.choice(self.category_ids),
+                "created_at": self.timestamp(offset),
+                "likes_count": 0
+            }
+
+    def post_offset(self, post_id: int) -> float:
+        return self.post_offsets[post_id - self.first_ids["posts"]]
+
+    def post_author(self, post_id: int) -> int:
+        return self.post_authors[post_id - self.first_ids["posts"]]
+
+    def comments(self) -> Iterator[dict]:
+        comment_id = self.first_ids["comments"]
+        for batch_start in range(0, self.args.comments, self.args.batch_size):
+            last_comment_by_post = {}
+            for post_id in self.popular_posts(min(self.args.batch_size, self.args.comments - batch_start)):
+                parent = last_comment_by_post.get(post_id)
+                if parent and parent["depth"] < COMMENT_MAX_DEPTH and self.rng.random() < REPLY_SHARE:
+                    parent_id, root_id, depth, path = parent["id"], parent["root_id"], parent["depth"] + 1, parent["path"]
+                    offset = (parent["created_at"] - self.start).total_seconds()
+                else:
+                    parent_id, root_id, depth, path = None, comment_id, 0, ""
+                    offset = self.post_offset(post_id)
+
+                comment = {
+                    "id": comment_id,
+                    "content": " ".join(self.rng.choices(WORDS, k=self.rng.randint(3, 40))),
+                    "post_id": post_id,
+                    "author_id": self.rng.choice(self.user_ids),
+                    "created_at": self.timestamp(offset + self.rng.expovariate(1 / COMMENT_DELAY_SECONDS)),
+                    "parent_id": parent_id,
+                    "root_id": root_id,
+                    "depth": depth,
+                    "path": path + comment_path_segment(comment_id)
+                }
+                last_comment_by_post[post_id] = comment
+                comment_id += 1
+                yield comment
+
+    def likes(self) -> Iterator[dict]:
+        for batch_start in range(0, self.args.likes, self.args.batch_size):
+            pairs = {
+                (self.rng.choice(self.user_ids), post_id)
+                for post_id in self.popular_posts(min(self.args.batch_size, self.args.likes - batch_start))
+            }
+            for user_id, post_id in pairs:
+                yield {"user_id": user_id, "post_id": post_id}
+
+    def bookmarks(self) -> Iterator[dict]:
+        bookmark_id = self.first_ids["bookmarks"]
+        for batch_start in range(0, self.args.bookmarks, self.args.batch_size):
+            pairs = {
+                (self.rng.choice(self.user_ids), post_id)
+                for post_id in self.popular_posts(min(self.args.batch_size, self.args.bookmarks - batch_start))
+            }
+            for user_id, post_id in pairs:
+                yield {
+                    "id": bookmark_id,
+                    "user_id": user_id,
+                    "post_id": post_id,
+                    "created_at": self.timestamp(self.post_offset(post_id) + self.rng.expovariate(1 / COMMENT_DELAY_SECONDS))
+                }
+                bookmark_id += 1
+
+    def notifications(self) -> Iterator[dict]:
+        for notification_id, post_id in zip(
+            range(self.first_ids["notifications"], self.first_ids["notifications"] + self.args.notifications),
+            itertools.chain.from_iterable(
+                self.popular_posts(min(self.args.batch_size, self.args.notifications - batch_start))
+                for batch_start in range(0, self.args.notifications, self.args.batch_size)
+            )
+        ):
+            yield {
+                "id": notification_id,
+                "user_id": self.post_author(post_id),
+                "content": f"load_{self.rng.choice(self.user_ids)} liked your post",
+                "notification_type": "post_like",
+                "related_id": post_id,
+                "is_read": self.rng.random() < READ_NOTIFICATION_SHARE,
+                "created_at": self.timestamp(self.post_offset(post_id) + self.rng.expovariate(1 / COMMENT_DELAY_SECONDS))
+            }
+
+WORDS = (
+    "blog post api redis kafka mysql cache query index latency throughput zagreb split rijeka osijek "
+    "kuhanje putovanje tehnologija sport glazba film knjiga programiranje python fastapi baza podataka "
+    "performance scaling feed trending comment like bookmark notification search ranking"
+).split()
+
+def next_ids(connection: Connection) -> Dict[str, int]:
+    tables = {"users": User, "categories": Category, "posts": Post, "comments": Comment, "bookmarks": Bookmark, "notifications": Notification}
+    return {
+        name: (connection.scalar(select(func.max(model.id))) or 0) + 1
+        for name, model in tables.items()
+    }
+
+def insert_rows(engine: Engine, table, rows: Iterator[dict], batch_size: int, ignore_duplicates: bool = False) -> int:
+    stmt = table.insert()
+    if ignore_duplicates:
+        stmt = stmt.prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+    inserted = 0
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return inserted
+
+        with engine.begin() as connection:
+            skip_foreign_key_checks = connection.dialect.name == "mysql"
+            if skip_foreign_key_checks:
+                connection.exec_driver_sql("SET foreign_key_checks = 0")
+            try:
+                connection.execute(stmt, batch)
+            finally:
+                # The setting is per session and the connection goes back to the pool.
+                if skip_foreign_key_checks:
+                    connection.exec_driver_sql("SET foreign_key_checks = 1")
+        inserted += len(batch)
+        print(f"  {table.name}: {inserted} rows", file=sys.stderr, end="\r")
+
+async def finish(data: SyntheticData, prewarm_posts: int, prewarm_pages: int) -> Dict[str, int]:
+    try:
+        return await rebuild_and_prewarm(data, prewarm_posts, prewarm_pages)
+    finally:
+        await close_redis_clients()
+        await async_engine.dispose()
+
+async def rebuild_and_prewarm(data: SyntheticData, prewarm_posts: int, prewarm_pages: int) -> Dict[str, int]:
+    async with AsyncSessionLocal() as db:
+        if data.args.posts:
+            await recompute_likes_counts(db, data.post_ids[0], data.post_ids[-1], data.args.batch_size)
+        counters = await rebuild_counters(db)
+        if not prewarm_posts and not prewarm_pages:
+            return {"counters": counters}
+
+        hot_post_ids = list(dict.fromkeys(data.ranked_post_ids[:prewarm_posts]))
+        for chunk_start in range(0, len(hot_post_ids), POSTS_BATCH_MAX_IDS):
+            await get_posts_by_ids(db, hot_post_ids[chunk_start:chunk_start + POSTS_BATCH_MAX_IDS])
+
+        list_pages = 0
+        for category_id in [None, *data.category_ids]:
+            cursor = None
+            for _ in range(prewarm_pages):
+                result = await list_posts(db, filters=PostFilter(category_id=category_id), cursor=cursor)
+                list_pages += 1
+                cursor = result["next_cursor"]
+                if not cursor:
+                    break
+
+    return {"counters": counters, "prewarmed_posts": len(hot_post_ids), "prewarmed_list_pages": list_pages}
+
+def load(args: argparse.Namespace) -> dict:
+    engine = create_sync_engine()
+    try:
+        with engine.connect() as connection:
+            first_ids = next_ids(connection)
+
+        data = SyntheticData(args, first_ids)
+        steps: List[tuple] = [
+            ("users", User.__table__, lambda: data.users(hash_password_sync(args.password)), False),
+            ("categories", Category.__table__, data.categories, False),
+            ("posts", Post.__table__, data.posts, False),
+            ("comments", Comment.__table__, data.comments, False),
+            ("likes", post_likes, data.likes, True),
+            ("bookmarks", Bookmark.__table__, data.bookmarks, True),
+            ("notifications", Notification.__table__, data.notifications, False)
+        ]
+
+        started = time.perf_counter()
+        tables = {}
+        for name, table, rows_factory, ignore_duplicates in steps:
+            step_started = time.perf_counter()
+            rows = insert_rows(engine, table, iter(rows_factory()), args.batch_size, ignore_duplicates)
+            seconds = time.perf_counter() - step_started
+            tables[name] = {"rows": rows, "seconds": round(seconds, 2), "rows_per_second": round(rows / seconds) if seconds else rows}
+            print(f"{name}: {rows} rows in {seconds:.1f}s", file=sys.stderr)
+    finally:
+        engine.dispose()
+
+    finished = asyncio.run(finish(data, args.prewarm_posts, args.prewarm_pages))
+
+    return {
+        "database": engine.url.render_as_string(hide_password=True),
+        "first_ids": first_ids,
+        "tables": tables,
+        "total_rows": sum(table["rows"] for table in tables.values()),
+        "seconds": round(time.perf_counter() - started, 2),
+        **finished
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load skewed synthetic data into the configured database for load testing")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=1000000)
+    parser.add_argument("--comments", type=int, default=3000000)
+    parser.add_argument("--likes", type=int, default=5000000)
+    parser.add_argument("--bookmarks", type=int, default=500000)
+    parser.add_argument("--notifications", type=int, default=1000000)
+    parser.add_argument("--heavy-authors", type=int, default=20, help="authors that write a disproportionate share of posts")
+    parser.add_argument("--heavy-author-share", type=float, default=0.3, help="share of posts written by heavy authors")
+    parser.add_argument("--zipf-exponent", type=float, default=1.1, help="skew of post popularity for comments, likes and bookmarks")
+    parser.add_argument("--days", type=int, default=365, help="time span of generated timestamps")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--password", default="loadtest-password", help="password of every generated user")
+    parser.add_argument("--prewarm-posts", type=int, default=0, help="cache this many of the most popular posts in Redis")
+    parser.add_argument("--prewarm-pages", type=int, default=0, help="cache this many list pages overall and per category")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.users < 1 or args.categories < 1 or (args.posts < 1 and (args.comments or args.likes or args.bookmarks or args.notifications)):
+        parser.error("at least one user and category, and one post when generating interactions, are required")
+
+    print(json.dumps(load(args), indent=2))
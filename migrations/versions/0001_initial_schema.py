@@ -0,0 +1,229 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Creates every table and hot-query index. Databases that were previously
+bootstrapped with metadata.create_all are upgraded in place: missing tables,
+columns and indexes are added and derived values are backfilled.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+PATH_SEGMENT_WIDTH = 10
+BACKFILL_BATCH_SIZE = 1000
+
+def table_columns():
+    return {
+        'users': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('username', sa.String(50), nullable=False),
+            sa.Column('email', sa.String(100), nullable=False),
+            sa.Column('hashed_password', sa.String(255), nullable=False),
+            sa.Column('role', sa.Enum('USER', 'ADMIN', name='userrole'), nullable=False)
+        ],
+        'categories': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(100), nullable=False, unique=True),
+            sa.Column('description', sa.Text(), nullable=True)
+        ],
+        'posts': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('title', sa.String(255), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id'), nullable=True)
+        ],
+        'post_likes': lambda: [
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+            sa.Column('post_id', sa.Integer(), sa.ForeignKey('posts.id'), primary_key=True)
+        ],
+        'comments': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('post_id', sa.Integer(), sa.ForeignKey('posts.id'), nullable=False),
+            sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('parent_id', sa.Integer(), nullable=True),
+            sa.Column('root_id', sa.Integer(), nullable=True),
+            sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('path', sa.String(255), nullable=True)
+        ],
+        'bookmarks': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('post_id', sa.Integer(), sa.ForeignKey('posts.id'), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+        ],
+        'notifications': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('content', sa.String(255), nullable=False),
+            sa.Column('notification_type', sa.String(50), nullable=False),
+            sa.Column('related_id', sa.Integer(), nullable=True),
+            sa.Column('is_read', sa.Boolean(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+        ],
+        'counters': lambda: [
+            sa.Column('name', sa.String(100), primary_key=True),
+            sa.Column('value', sa.BigInteger(), nullable=False, server_default='0')
+        ],
+        'outbox_events': lambda: [
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('topic', sa.String(255), nullable=False),
+            sa.Column('message_key', sa.String(255), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+        ],
+        'author_follows': lambda: [
+            sa.Column('follower_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+            sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+        ],
+        'category_follows': lambda: [
+            sa.Column('follower_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+            sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id'), primary_key=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+        ]
+    }
+
+INDEXES = [
+    ('ix_users_id', 'users', ['id'], False),
+    ('ix_users_username', 'users', ['username'], True),
+    ('ix_users_email', 'users', ['email'], True),
+    ('ix_categories_id', 'categories', ['id'], False),
+    ('ix_posts_id', 'posts', ['id'], False),
+    ('ix_posts_created_at', 'posts', ['created_at'], False),
+    ('ix_posts_category_created', 'posts', ['category_id', 'created_at'], False),
+    ('ix_posts_author_created', 'posts', ['author_id', 'created_at'], False),
+    ('ix_post_likes_post_id', 'post_likes', ['post_id'], False),
+    ('ix_comments_id', 'comments', ['id'], False),
+    ('ix_comments_parent_id', 'comments', ['parent_id'], False),
+    ('ix_comments_post_created', 'comments', ['post_id', 'created_at'], False),
+    ('ix_comments_post_path', 'comments', ['post_id', 'path'], False),
+    ('ix_comments_post_depth_created', 'comments', ['post_id', 'depth', 'created_at'], False),
+    ('ix_comments_root_path', 'comments', ['root_id', 'path'], False),
+    ('ix_bookmarks_id', 'bookmarks', ['id'], False),
+    ('uq_bookmarks_user_post', 'bookmarks', ['user_id', 'post_id'], True),
+    ('ix_notifications_id', 'notifications', ['id'], False),
+    ('ix_notifications_user_read_created', 'notifications', ['user_id', 'is_read', 'created_at'], False),
+    ('ix_outbox_events_id', 'outbox_events', ['id'], False),
+    ('ix_author_follows_author_follower', 'author_follows', ['author_id', 'follower_id'], False),
+    ('ix_category_follows_category_follower', 'category_follows', ['category_id', 'follower_id'], False)
+]
+
+def ensure_table(inspector, name, columns_factory):
+    if not inspector.has_table(name):
+        op.create_table(name, *columns_factory())
+        return set(), True
+
+    existing_columns = {column['name'] for column in inspector.get_columns(name)}
+    added_columns = set()
+    for column in columns_factory():
+        if column.name not in existing_columns:
+            op.add_column(name, column)
+            added_columns.add(column.name)
+
+    return added_columns, False
+
+def ensure_index(inspector, name, table, columns, unique):
+    existing_indexes = {index['name'] for index in inspector.get_indexes(table)}
+    existing_indexes.update(constraint['name'] for constraint in inspector.get_unique_constraints(table))
+    if name not in existing_indexes:
+        op.create_index(name, table, columns, unique=unique)
+
+def remove_duplicate_bookmarks():
+    op.execute(
+        "DELETE FROM bookmarks WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM bookmarks GROUP BY user_id, post_id) AS keep_bookmarks"
+        ")"
+    )
+
+def backfill_likes_count():
+    op.execute(
+        "UPDATE posts SET likes_count = "
+        "(SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id)"
+    )
+
+def backfill_comment_paths(bind):
+    comments = sa.table('comments', sa.column('id', sa.Integer), sa.column('root_id', sa.Integer), sa.column('depth', sa.Integer), sa.column('path', sa.String))
+
+    while True:
+        comment_ids = [row[0] for row in bind.execute(
+            sa.select(comments.c.id).where(comments.c.path.is_(None)).order_by(comments.c.id).limit(BACKFILL_BATCH_SIZE)
+        )]
+        if not comment_ids:
+            return
+
+        bind.execute(
+            comments.update().where(comments.c.id == sa.bindparam('comment_id')).values(
+                root_id=sa.bindparam('comment_id'),
+                depth=0,
+                path=sa.bindparam('comment_path')
+            ),
+            [
+                {'comment_id': comment_id, 'comment_path': f"{comment_id:0{PATH_SEGMENT_WIDTH}d}/"}
+                for comment_id in comment_ids
+            ]
+        )
+
+def seed_counters(bind):
+    counters = sa.table('counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+
+    values = {
+        'posts:total': bind.execute(sa.text("SELECT COUNT(*) FROM posts")).scalar(),
+        'categories:total': bind.execute(sa.text("SELECT COUNT(*) FROM categories")).scalar()
+    }
+
+    grouped_counts = [
+        ('posts:category:{}', "SELECT category_id, COUNT(*) FROM posts WHERE category_id IS NOT NULL GROUP BY category_id"),
+        ('posts:author:{}', "SELECT author_id, COUNT(*) FROM posts GROUP BY author_id"),
+        ('comments:post:{}', "SELECT post_id, COUNT(*) FROM comments GROUP BY post_id"),
+        ('bookmarks:user:{}', "SELECT user_id, COUNT(*) FROM bookmarks GROUP BY user_id"),
+        ('notifications:unread:user:{}', "SELECT user_id, COUNT(*) FROM notifications WHERE is_read = 0 GROUP BY user_id")
+    ]
+
+    for name_format, query in grouped_counts:
+        for owner_id, count in bind.execute(sa.text(query)):
+            values[name_format.format(owner_id)] = count
+
+    op.bulk_insert(counters, [{'name': name, 'value': value} for name, value in values.items()])
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    added_columns = {}
+    created_tables = set()
+    for name, columns_factory in table_columns().items():
+        added, created = ensure_table(sa.inspect(bind), name, columns_factory)
+        added_columns[name] = added
+        if created:
+            created_tables.add(name)
+
+    if 'bookmarks' not in created_tables:
+        remove_duplicate_bookmarks()
+    if 'likes_count' in added_columns['posts']:
+        backfill_likes_count()
+    if 'path' in added_columns['comments']:
+        backfill_comment_paths(bind)
+    if 'counters' in created_tables:
+        seed_counters(bind)
+
+    inspector = sa.inspect(bind)
+    for name, table, columns, unique in INDEXES:
+        ensure_index(inspector, name, table, columns, unique)
+
+def downgrade() -> None:
+    for name in reversed(list(table_columns())):
+        op.drop_table(name)
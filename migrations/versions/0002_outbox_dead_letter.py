@@ -0,0 +1,30 @@
+"""outbox dead letter
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Adds the dead-letter marker for outbox events that exhausted their delivery
+attempts and the (message_key, id) index the relay uses to claim the oldest
+pending event of every key.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if 'dead_lettered_at' not in {column['name'] for column in inspector.get_columns('outbox_events')}:
+        op.add_column('outbox_events', sa.Column('dead_lettered_at', sa.DateTime(timezone=True), nullable=True))
+    if 'ix_outbox_events_key_id' not in {index['name'] for index in inspector.get_indexes('outbox_events')}:
+        op.create_index('ix_outbox_events_key_id', 'outbox_events', ['message_key', 'id'])
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_key_id', table_name='outbox_events')
+    op.drop_column('outbox_events', 'dead_lettered_at')
@@ -0,0 +1,47 @@
+"""rebuild counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Recomputes every row of the counters table from the source tables. Revision
+0001 only seeds counters when it creates the table, so databases whose table
+already existed (or was filled by increments that started from zero) carry
+wrong totals until they are rebuilt.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+GROUPED_COUNTS = [
+    ('posts:category:{}', "SELECT category_id, COUNT(*) FROM posts WHERE category_id IS NOT NULL GROUP BY category_id"),
+    ('posts:author:{}', "SELECT author_id, COUNT(*) FROM posts GROUP BY author_id"),
+    ('comments:post:{}', "SELECT post_id, COUNT(*) FROM comments GROUP BY post_id"),
+    ('bookmarks:user:{}', "SELECT user_id, COUNT(*) FROM bookmarks GROUP BY user_id"),
+    ('notifications:unread:user:{}', "SELECT user_id, COUNT(*) FROM notifications WHERE is_read = 0 GROUP BY user_id"),
+    ('followers:author:{}', "SELECT author_id, COUNT(*) FROM author_follows GROUP BY author_id"),
+    ('followers:category:{}', "SELECT category_id, COUNT(*) FROM category_follows GROUP BY category_id")
+]
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    counters = sa.table('counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+
+    values = {
+        'posts:total': bind.execute(sa.text("SELECT COUNT(*) FROM posts")).scalar(),
+        'categories:total': bind.execute(sa.text("SELECT COUNT(*) FROM categories")).scalar()
+    }
+    for name_format, query in GROUPED_COUNTS:
+        for owner_id, count in bind.execute(sa.text(query)):
+            values[name_format.format(owner_id)] = count
+
+    op.execute(counters.delete())
+    op.bulk_insert(counters, [{'name': name, 'value': value} for name, value in values.items()])
+
+def downgrade() -> None:
+    pass
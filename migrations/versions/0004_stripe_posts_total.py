@@ -0,0 +1,34 @@
+"""stripe posts total
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Moves the single `posts:total` counter row onto shard rows
+(`posts:total:{shard}`). Every post write used to update that one row, so
+concurrent writers queued on its lock; readers now sum the shards.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    counters = sa.table('counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+
+    total = bind.execute(sa.text("SELECT COUNT(*) FROM posts")).scalar()
+    op.execute(counters.delete().where(sa.or_(counters.c.name == 'posts:total', counters.c.name.like('posts:total:%'))))
+    op.bulk_insert(counters, [{'name': 'posts:total:0', 'value': total}])
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    counters = sa.table('counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+
+    total = bind.execute(sa.text("SELECT COUNT(*) FROM posts")).scalar()
+    op.execute(counters.delete().where(counters.c.name.like('posts:total:%')))
+    op.bulk_insert(counters, [{'name': 'posts:total', 'value': total}])